@@ -6,9 +6,15 @@ running an AI model).  It establishes a TCP connection to the Raspberry Pi
 server, registers a UDP port for receiving video, and reads input from a
 PlayStation 5 DualSense controller (or any other joystick recognised by
 pygame).  Joystick values are translated into car control commands and
-sent as JSON messages over the TCP connection.  A background thread
-receives JPEG‑encoded video frames via UDP, decodes them with OpenCV
-and displays them in a simple window.
+sent as fixed‑size binary frames over the TCP connection (see the protocol
+description in ``raspi_server.py``).  This client only works with
+``raspi_server.py``: ``servidor.py`` speaks the newline‑delimited JSON
+protocol of ``controle.py`` and closes connections that start with a
+binary frame.  JPEG‑encoded video frames
+are received via UDP, decoded (on the GPU with nvJPEG when PyTorch/
+torchvision and CUDA are available, otherwise with OpenCV on the CPU) and
+displayed in a simple window.  All sockets and the joystick device are
+multiplexed by a single ``asyncio`` event loop.
 The Keyestudio Smart Car documentation suggests using TCP for control
 commands and UDP for video streaming【170506542320415†L50-L55】.  Control commands
 must be reliable and ordered, whereas video frames are tolerant of
@@ -20,20 +26,30 @@ Usage example::
 
 Dependencies:
     * pygame (for joystick input)
+    * msgpack (for status messages from the server)
     * opencv-python (for video decoding and display)
+    * torch + torchvision (optional; GPU JPEG decoding via nvJPEG)
+    * numba (optional; compiles the joystick axis mapping)
+    * orjson (optional; faster JSON for control-plane messages)
 
 Install these on your machine via pip if necessary::
 
-    pip install pygame opencv-python
+    pip install pygame opencv-python msgpack
 
 """
 
 import argparse
+import asyncio
 import json
+import os
 import socket
+import struct
+import sys
 import threading
 import time
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+import msgpack  # type: ignore
 
 try:
     import numpy as np  # type: ignore
@@ -42,250 +58,576 @@ except ImportError:
     np = None  # type: ignore
     cv2 = None  # type: ignore
 
+try:
+    import torch  # type: ignore
+    from torchvision.io import ImageReadMode, decode_jpeg, encode_jpeg  # type: ignore
+except ImportError:
+    torch = None  # type: ignore
+
 try:
     import pygame  # type: ignore
 except ImportError:
     pygame = None  # type: ignore
 
+try:
+    from numba import njit  # type: ignore
+except ImportError:
+    njit = None  # type: ignore
 
-class VideoReceiver(threading.Thread):
-    """Thread that receives JPEG frames over UDP and displays them."""
-
-    def __init__(self, udp_port: int) -> None:
-        super().__init__(daemon=True)
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+from tuning import pin_current_thread, tune_control_socket
+
+# Video datagram header: frame id, chunk index, chunk count.  Must match
+# the sender in raspi_server.py.
+_FRAG_HDR = struct.Struct('!IHH')
+_FRAG_PAYLOAD = 1400
+# Kept small on purpose: when the client falls behind, the kernel drops
+# datagrams instead of queueing seconds of stale video.
+_VIDEO_RCVBUF = 262144
+
+# Control protocol.  Must match raspi_server.py.
+CMD_MOVE = 1
+CMD_STOP = 2
+CMD_QUIT = 3
+CMD_REGVIDEO = 4
+CMD_STATUS = 5
+DIR = {"stop": 0, "forward": 1, "backward": 2}
+_HDR = struct.Struct('<BBff')
+_JSON_HDR = struct.Struct('<BH')
+# Status messages from the server: big-endian length prefix + msgpack payload
+_STATUS_HDR = struct.Struct('!H')
+
+
+def _axis_command(axis_y: float, axis_x: float, deadzone: float) -> Tuple[int, float, float]:
+    """Map the stick axes to ``(dir_id, speed, steering)``.
+
+    In pygame, up on the joystick returns -1, down returns +1; forward
+    movement is mapped to positive speed.  ``dir_id`` uses the ``DIR``
+    values (0 stop, 1 forward, 2 backward).  Compiled with Numba when it
+    is installed.
+    """
+    dir_id = 0
+    speed = 0.0
+    # Apply deadzone
+    if abs(axis_y) > deadzone:
+        if axis_y < 0:
+            dir_id = 1
+            speed = min(1.0, -axis_y)  # invert sign; range 0-1
+        else:
+            dir_id = 2
+            speed = min(1.0, axis_y)
+    steering = 0.0
+    if abs(axis_x) > deadzone:
+        steering = max(-1.0, min(1.0, axis_x))
+    return dir_id, speed, steering
+
+
+if njit is not None:
+    _axis_command = njit(cache=True)(_axis_command)
+
+
+def encode_json_message(cmd_id: int, msg: dict) -> bytes:
+    """Frame a JSON control-plane message (e.g. ``register_video``)."""
+    if orjson is not None:
+        payload = orjson.dumps(msg)
+    else:
+        payload = json.dumps(msg).encode('utf-8')
+    return _JSON_HDR.pack(cmd_id, len(payload)) + payload
+
+
+class VideoReceiver:
+    """Receives JPEG frames over UDP and displays them.
+
+    Frames are decoded with nvJPEG (``backend="nvjpeg"``) when CUDA is
+    available, so they land directly in GPU memory ready for inference;
+    otherwise ``cv2.imdecode`` is used (``backend="cv2"``).
+
+    Datagrams are collected for up to ``batch_window`` seconds (or until
+    ``batch`` frames are pending) and handed to nvJPEG in a single call,
+    which amortises kernel launches and host-to-device copies.
+
+    Frames arrive split into several datagrams (see ``_FRAG_HDR``); they are
+    received into a single reused packet buffer and reassembled in place.
+    Only one frame is assembled at a time: a chunk of a newer frame drops
+    whatever is left of an incomplete older one.
+
+    The socket is drained completely on every wakeup and only the newest
+    ``batch`` frames are kept, so decoding never falls behind the stream.
+
+    Socket handling runs in the client's event loop, while decoding and
+    display run in a worker thread pinned away from CPU 0 so they never
+    delay joystick commands.  Complete frames are handed over through a
+    single slot that always holds the newest batch.
+
+    On the CPU path completed frames are decoded straight from their
+    reassembly buffer, and buffers are recycled through a small pool, so
+    no per‑frame allocation is made; ``reduced=True`` additionally lets
+    libjpeg‑turbo decode at half resolution using its scaled IDCT.
+    """
+
+    def __init__(self, udp_port: int, backend: Optional[str] = None,
+                 batch: int = 8, batch_window: float = 0.02, reduced: bool = False) -> None:
         self.udp_port = udp_port
+        self.backend = backend or self._pick_backend()
+        self.imread_flag = cv2.IMREAD_REDUCED_COLOR_2 if reduced and cv2 is not None else None
+        if self.backend == "nvjpeg":
+            self._warm_up()
+        # Batching only pays off on the GPU; the CPU decodes the newest frame at once
+        self.batch = batch if self.backend == "nvjpeg" else 1
+        self.batch_window = batch_window
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _VIDEO_RCVBUF)
         # Bind to all interfaces on the given port
         self.sock.bind(("", udp_port))
+        self.sock.setblocking(False)
+        # Reassembly state; the packet buffer is reused for every datagram
+        self._packet = bytearray(_FRAG_HDR.size + _FRAG_PAYLOAD)
+        self._packet_view = memoryview(self._packet)
+        self._frame = bytearray(65536)
+        self._frame_id: Optional[int] = None
+        self._frame_seen = bytearray()
+        self._frame_missing = 0
+        self._frame_len = 0
+        self.pending: List[memoryview] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Hand-over to the decode thread; _spare holds recycled frame buffers
+        self._cond = threading.Condition()
+        self._slot: Optional[List[memoryview]] = None
+        self._spare: List[bytearray] = []
+        self._worker: Optional[threading.Thread] = None
         self.running = True
         # Frame display toggle; disable GUI on headless systems where DISPLAY is not set.
-        import os
         self.display = (cv2 is not None) and bool(os.environ.get('DISPLAY'))
+
+    @staticmethod
+    def _pick_backend() -> str:
+        if torch is not None and torch.cuda.is_available():
+            return "nvjpeg"
+        if cv2 is not None and hasattr(cv2, "cuda") and cv2.cuda.getCudaEnabledDeviceCount() > 0:
+            # OpenCV's CUDA modules have no still-image JPEG decoder, so a
+            # CUDA build of OpenCV alone does not move decoding to the GPU.
+            print("[VideoReceiver] CUDA device found but torch/torchvision is missing; "
+                  "decoding on the CPU")
+        return "cv2"
+
+    @staticmethod
+    def _warm_up() -> None:
+        """Decode a blank frame so CUDA context creation and nvJPEG setup
+        happen at start-up instead of stalling the first real frame.
+        """
+        blank = encode_jpeg(torch.zeros((3, 240, 320), dtype=torch.uint8))
+        decode_jpeg(blank, device="cuda")
+        torch.cuda.synchronize()
+
+    def _reassemble(self, n: int) -> Optional[memoryview]:
+        """Add the datagram in the packet buffer (``n`` bytes) to the frame
+        being assembled; return the JPEG bytes once the frame is complete.
+        """
+        if n < _FRAG_HDR.size:
+            return None
+        frame_id, idx, total = _FRAG_HDR.unpack_from(self._packet)
+        payload = n - _FRAG_HDR.size
+        if idx >= total or payload > _FRAG_PAYLOAD:
+            return None
+        if frame_id != self._frame_id:
+            if self._frame_id is not None and (self._frame_id - frame_id) & 0xFFFFFFFF < 64:
+                # Late chunk of a frame we already gave up on
+                return None
+            self._frame_id = frame_id
+            self._frame_seen = bytearray(total)
+            self._frame_missing = total
+            self._frame_len = 0
+            if len(self._frame) < total * _FRAG_PAYLOAD:
+                self._frame = bytearray(total * _FRAG_PAYLOAD)
+        if self._frame_missing <= 0 or self._frame_seen[idx]:
+            return None
+        offset = idx * _FRAG_PAYLOAD
+        self._frame[offset:offset + payload] = self._packet_view[_FRAG_HDR.size:n]
+        self._frame_seen[idx] = 1
+        self._frame_missing -= 1
+        if idx == total - 1:
+            self._frame_len = offset + payload
+        if self._frame_missing:
+            return None
+        if self.batch > 1:
+            # Several frames may be pending at once; each needs its own copy
+            return memoryview(self._frame[:self._frame_len])
+        # A single pending frame: hand out the buffer itself and assemble
+        # the next frame in a recycled one.
+        view = memoryview(self._frame)[:self._frame_len]
+        with self._cond:
+            self._frame = self._spare.pop() if self._spare else bytearray(len(self._frame))
+        return view
+
+    def _recycle(self, frames: List[memoryview]) -> None:
+        """Return the reassembly buffers behind ``frames`` to the pool."""
+        if self.batch > 1:
+            return  # frames are private copies
+        with self._cond:
+            self._spare.extend(view.obj for view in frames)
+
+    def _decode(self, data: memoryview):
+        """Decode one JPEG datagram; returns ``None`` for corrupt frames.
+
+        The nvJPEG backend returns a CHW RGB ``uint8`` tensor on the GPU,
+        the OpenCV backend an HWC BGR ``ndarray``.
+        """
+        if self.backend == "nvjpeg":
+            # torchvision keeps its nvJPEG handle alive between calls, so
+            # there is no per-frame decoder setup cost here.
+            tensor = torch.frombuffer(data, dtype=torch.uint8)
+            try:
+                return decode_jpeg(tensor, mode=ImageReadMode.RGB, device="cuda")
+            except RuntimeError:
+                return None
+        np_data = np.frombuffer(data, dtype=np.uint8)
+        if self.imread_flag is not None:
+            return cv2.imdecode(np_data, self.imread_flag)
+        return cv2.imdecode(np_data, cv2.IMREAD_COLOR)
+
+    def _decode_batch(self, pending: List[memoryview]) -> list:
+        """Decode the pending datagrams, returning the valid frames in order."""
+        if self.backend == "nvjpeg":
+            tensors = [torch.frombuffer(data, dtype=torch.uint8) for data in pending]
+            try:
+                return decode_jpeg(tensors, mode=ImageReadMode.RGB, device="cuda")
+            except RuntimeError:
+                # A single corrupt datagram fails the whole batch; retry one by one
+                frames = [self._decode(data) for data in pending]
+                return [frame for frame in frames if frame is not None]
+        # The CPU decoder gains nothing from batching, so only the newest
+        # frame is decoded.
+        frame = self._decode(pending[-1])
+        return [] if frame is None else [frame]
+
+    def _to_display(self, frame):
+        """Convert a decoded frame into a BGR ``ndarray`` for ``cv2.imshow``."""
+        if self.backend == "nvjpeg":
+            # RGB -> BGR and CHW -> HWC on the GPU; only the result is copied back.
+            return frame.flip(0).permute(1, 2, 0).contiguous().cpu().numpy()
+        return frame
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Watch the video socket from ``loop`` and start the decode thread."""
+        if self.backend == "cv2" and (np is None or cv2 is None):
+            print("[VideoReceiver] numpy/cv2 not available; cannot decode frames")
+            return
+        # A plain reader callback rather than a datagram protocol: it drains
+        # the socket into the reused packet buffer with recvfrom_into, where
+        # the transport would allocate a bytes object per datagram.
+        self._loop = loop
+        loop.add_reader(self.sock, self.on_readable)
+        self._worker = threading.Thread(target=self._decode_loop, daemon=True)
+        self._worker.start()
+        print(f"[VideoReceiver] Listening for video on UDP port {self.udp_port} "
+              f"(decoder: {self.backend})")
+
+    def on_readable(self) -> None:
+        """Drain the socket, keeping only the newest ``batch`` frames."""
+        try:
+            while True:
+                try:
+                    n, _ = self.sock.recvfrom_into(self._packet)
+                except BlockingIOError:
+                    break
+                data = self._reassemble(n)
+                if data is None:
+                    continue
+                if not self.pending and self.batch > 1:
+                    # Decode whatever has arrived once the window elapses
+                    self._flush_timer = self._loop.call_later(self.batch_window, self.flush)
+                self.pending.append(data)
+                if len(self.pending) > self.batch:
+                    # Drop the stale frame rather than decode it
+                    self._recycle([self.pending.pop(0)])
+            if len(self.pending) >= self.batch:
+                self.flush()
+        except Exception as e:
+            print(f"[VideoReceiver] Error receiving frame: {e}")
+
+    def flush(self) -> None:
+        """Hand the pending frames to the decode thread."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        pending, self.pending = self.pending, []
+        with self._cond:
+            stale, self._slot = self._slot, pending
+            self._cond.notify()
+        if stale:
+            # The decoder had not picked these up yet; they are outdated now
+            self._recycle(stale)
+
+    def _decode_loop(self) -> None:
+        # Keep decoding off CPU 0, which is reserved for the control loop
+        pin_current_thread(set(range(1, os.cpu_count() or 1)), tag="[VideoReceiver]")
         if self.display:
             try:
                 cv2.namedWindow("Car Camera", cv2.WINDOW_AUTOSIZE)
             except Exception:
                 # Failed to create a window; disable display
                 self.display = False
-
-    def run(self) -> None:
-        if np is None or cv2 is None:
-            print("[VideoReceiver] numpy/cv2 not available; cannot decode frames")
-            return
-        print(f"[VideoReceiver] Listening for video on UDP port {self.udp_port}")
         while self.running:
+            with self._cond:
+                while self._slot is None and self.running:
+                    self._cond.wait(0.5)
+                pending, self._slot = self._slot, None
+            if not pending:
+                continue
             try:
-                data, _ = self.sock.recvfrom(65536)
-                if not data:
-                    continue
-                np_data = np.frombuffer(data, dtype=np.uint8)
-                frame = cv2.imdecode(np_data, cv2.IMREAD_COLOR)
-                if frame is None:
-                    continue
-                # Display the frame
-                if self.display:
-                    cv2.imshow("Car Camera", frame)
+                frames = self._decode_batch(pending)
+                # Display only the newest frame; older ones are stale already
+                if frames and self.display:
+                    cv2.imshow("Car Camera", self._to_display(frames[-1]))
                     cv2.waitKey(1)
             except Exception as e:
-                print(f"[VideoReceiver] Error receiving frame: {e}")
-                time.sleep(0.01)
+                print(f"[VideoReceiver] Error decoding frame: {e}")
+            finally:
+                self._recycle(pending)
         if self.display:
             cv2.destroyWindow("Car Camera")
+
+    def close(self) -> None:
+        if self._loop is not None:
+            self._loop.remove_reader(self.sock)
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        if self._worker is not None:
+            self._worker.join(timeout=1.0)
         self.sock.close()
-        print("[VideoReceiver] Video thread terminated")
+        print("[VideoReceiver] Video receiver closed")
 
-    def stop(self) -> None:
-        self.running = False
 
+class JoystickController:
+    """Reads the joystick and sends control commands.
 
-class JoystickController(threading.Thread):
-    """Thread that reads joystick events and sends control commands."""
+    On Linux the joystick device (``/dev/input/js0``) is opened without
+    blocking and watched by the event loop, so the controller wakes as
+    soon as the stick moves; the axes are still read through pygame.
+    Without the device node the axes are polled every ``poll_interval``.
 
-    def __init__(self, client_socket: socket.socket, send_lock: threading.Lock) -> None:
-        super().__init__(daemon=True)
-        self.client_socket = client_socket
-        self.send_lock = send_lock
+    Commands are written to the connection's ``StreamWriter``; ``run``
+    drains it so a stalled connection applies back-pressure instead of
+    buffering stale commands.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, js_device: str = "/dev/input/js0") -> None:
+        self.writer = writer
+        self.js_device = js_device
+        self.js_fd: Optional[int] = None
+        self.joystick = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup = asyncio.Event()
         self.running = True
         self.prev_speed = 0.0
         self.prev_steering = 0.0
         self.axis_deadzone = 0.1  # ignore small movements
         self.send_interval = 0.05  # seconds between command transmissions
+        self.poll_interval = 0.004  # 250 Hz; used only when the device node is unavailable
+        self.last_sent = 0.0
+        self.next_poll = 0.0
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Initialise pygame and watch the joystick device, if any.
 
-    def run(self) -> None:
+        Returns ``False`` when no joystick is available.
+        """
         if pygame is None:
             print("[Joystick] pygame not available; joystick control disabled")
-            return
+            return False
         pygame.init()
         pygame.joystick.init()
         num_joysticks = pygame.joystick.get_count()
         if num_joysticks == 0:
             print("[Joystick] No joystick detected; please connect a controller")
-            return
-        joystick = pygame.joystick.Joystick(0)
-        joystick.init()
-        print(f"[Joystick] Using controller: {joystick.get_name()}")
-        last_sent = time.time()
+            return False
+        self.joystick = pygame.joystick.Joystick(0)
+        self.joystick.init()
+        print(f"[Joystick] Using controller: {self.joystick.get_name()}")
+        # Trigger Numba compilation now rather than on the first stick movement
+        _axis_command(0.0, 0.0, self.axis_deadzone)
+        try:
+            self.js_fd = os.open(self.js_device, os.O_RDONLY | os.O_NONBLOCK)
+        except (OSError, AttributeError):
+            self.js_fd = None
+        else:
+            loop.add_reader(self.js_fd, self.on_readable)
+            self._loop = loop
+        self.last_sent = time.monotonic()
+        return True
+
+    def on_readable(self) -> None:
+        """The joystick reported an event: discard the raw bytes and poll."""
         try:
-            while self.running:
-                # Pump events to get latest state
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                        break
-                # Read axis values
-                # The PS5 DualSense controller typically uses axis 1 (left stick Y)
-                # for throttle and axis 0 (left stick X) for steering.
-                axis_y = joystick.get_axis(1)
-                axis_x = joystick.get_axis(0)
-                # In pygame, up on the joystick returns -1, down returns +1.
-                # We map forward movement to positive speed.
-                speed = 0.0
-                direction = "stop"
-                # Apply deadzone
-                if abs(axis_y) > self.axis_deadzone:
-                    if axis_y < 0:
-                        direction = "forward"
-                        speed = min(1.0, -axis_y)  # invert sign; range 0-1
-                    else:
-                        direction = "backward"
-                        speed = min(1.0, axis_y)
-                steering = 0.0
-                if abs(axis_x) > self.axis_deadzone:
-                    steering = max(-1.0, min(1.0, axis_x))
-                # Send command if changed significantly or at interval
-                now = time.time()
-                if (
-                    abs(speed - self.prev_speed) > 0.05
-                    or abs(steering - self.prev_steering) > 0.05
-                    or now - last_sent >= self.send_interval
-                ):
-                    self.prev_speed = speed
-                    self.prev_steering = steering
-                    last_sent = now
-                    self.send_move_command(direction, speed, steering)
-                time.sleep(0.01)
-        finally:
-            # On exit, send stop command
-            self.send_move_command("stop", 0.0, 0.0)
-            pygame.joystick.quit()
-            pygame.quit()
-            print("[Joystick] Controller thread exiting")
-
-    def send_move_command(self, direction: str, speed: float, steering: float) -> None:
-        cmd = {
-            "cmd": "move" if direction != "stop" else "stop",
-            "direction": direction,
-            "speed": speed,
-            "steering": steering,
-        }
-        self.send_message(cmd)
-
-    def send_message(self, msg: dict) -> None:
-        # Send JSON message followed by newline
-        data = json.dumps(msg).encode('utf-8') + b"\n"
-        with self.send_lock:
+            while os.read(self.js_fd, 512):
+                pass
+        except BlockingIOError:
+            pass
+        self.poll(time.monotonic(), force=True)
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Poll the joystick until pygame reports a quit event."""
+        while self.running:
             try:
-                self.client_socket.sendall(data)
-            except Exception as e:
-                print(f"[Joystick] Failed to send command: {e}")
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, self.next_poll - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            self.poll(time.monotonic())
+            await self.writer.drain()
+
+    def poll(self, now: float, force: bool = False) -> None:
+        """Read the axes and send a command if due; ``force`` skips the wait."""
+        if self.joystick is None or (not force and now < self.next_poll):
+            return
+        self.next_poll = now + (self.send_interval if self.js_fd is not None else self.poll_interval)
+        # Pump events to get latest state
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+                return
+        # Read axis values
+        # The PS5 DualSense controller typically uses axis 1 (left stick Y)
+        # for throttle and axis 0 (left stick X) for steering.
+        dir_id, speed, steering = _axis_command(
+            self.joystick.get_axis(1), self.joystick.get_axis(0), self.axis_deadzone)
+        # Send command if changed significantly or at interval
+        if (
+            abs(speed - self.prev_speed) > 0.05
+            or abs(steering - self.prev_steering) > 0.05
+            or now - self.last_sent >= self.send_interval
+        ):
+            self.prev_speed = speed
+            self.prev_steering = steering
+            self.last_sent = now
+            self.send_move_command(dir_id, speed, steering)
+
+    def send_move_command(self, dir_id: int, speed: float, steering: float) -> None:
+        cmd_id = CMD_MOVE if dir_id != DIR["stop"] else CMD_STOP
+        try:
+            self.writer.write(_HDR.pack(cmd_id, dir_id, speed, steering))
+        except Exception as e:
+            print(f"[Joystick] Failed to send command: {e}")
 
-    def stop(self) -> None:
-        self.running = False
+    def close(self) -> None:
+        if self.joystick is None:
+            return
+        # On exit, send stop command
+        self.send_move_command(DIR["stop"], 0.0, 0.0)
+        if self.js_fd is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self.js_fd)
+            os.close(self.js_fd)
+        pygame.joystick.quit()
+        pygame.quit()
+        print("[Joystick] Controller closed")
 
 
-class StatusReceiver(threading.Thread):
-    """Thread that listens for status messages from the server over TCP."""
+class StatusReceiver:
+    """Listens for status messages from the server over TCP.
 
-    def __init__(self, client_socket: socket.socket, send_lock: threading.Lock) -> None:
-        super().__init__(daemon=True)
-        self.client_socket = client_socket
-        self.send_lock = send_lock
-        self.running = True
+    Each message is a msgpack map preceded by its length (``_STATUS_HDR``).
+    """
 
-    def run(self) -> None:
-        buffer = b""
-        while self.running:
-            try:
-                data = self.client_socket.recv(4096)
-                if not data:
-                    break
-                buffer += data
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
-                    if not line:
-                        continue
-                    try:
-                        msg = json.loads(line.decode('utf-8'))
-                        self.handle_status(msg)
-                    except json.JSONDecodeError:
-                        continue
-            except Exception:
-                time.sleep(0.01)
-        print("[StatusReceiver] Exiting status thread")
+    def __init__(self, reader: asyncio.StreamReader) -> None:
+        self.reader = reader
+
+    async def run(self) -> None:
+        """Read status messages until the server disconnects."""
+        try:
+            while True:
+                (length,) = _STATUS_HDR.unpack(await self.reader.readexactly(_STATUS_HDR.size))
+                payload = await self.reader.readexactly(length)
+                try:
+                    msg = msgpack.unpackb(payload)
+                except ValueError:
+                    continue
+                self.handle_status(msg)
+        except asyncio.IncompleteReadError:
+            print("[StatusReceiver] Server closed the connection")
+        except OSError as e:
+            print(f"[StatusReceiver] Error receiving status: {e}")
 
     def handle_status(self, msg: dict) -> None:
         # Simple handler for status messages; extend as needed
         print(f"[Status] {msg}")
 
-    def stop(self) -> None:
-        self.running = False
-
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Central client for Raspberry Pi car")
     parser.add_argument('--server_ip', required=True, help='IP address of the Raspberry Pi server')
     parser.add_argument('--server_port', type=int, default=5051, help='TCP port of the Raspberry Pi server')
     parser.add_argument('--video_port', type=int, default=6000, help='Local UDP port to receive video')
+    parser.add_argument('--reduced_video', action='store_true',
+                        help='Decode video at half resolution on the CPU (faster)')
     return parser.parse_args()
 
 
-def main() -> None:
-    args = parse_args()
-    # Create a TCP connection to the server
-    client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+async def run_client(args: argparse.Namespace) -> None:
+    loop = asyncio.get_running_loop()
+    # Open the TCP control connection to the server
     print(f"[Client] Connecting to {args.server_ip}:{args.server_port} ...")
-    client_socket.connect((args.server_ip, args.server_port))
+    reader, writer = await asyncio.open_connection(args.server_ip, args.server_port)
+    tune_control_socket(writer.get_extra_info('socket'))
     print("[Client] Connected to server")
-    send_lock = threading.Lock()
     # Register for video streaming
     register_msg = {"cmd": "register_video", "video_port": args.video_port}
-    client_socket.sendall(json.dumps(register_msg).encode('utf-8') + b"\n")
+    writer.write(encode_json_message(CMD_REGVIDEO, register_msg))
     print(f"[Client] Requested video stream on UDP port {args.video_port}")
-    # Start video receiver
-    video_receiver = VideoReceiver(args.video_port)
-    video_receiver.start()
-    # Start status receiver
-    status_receiver = StatusReceiver(client_socket, send_lock)
-    status_receiver.start()
-    # Start joystick controller
-    joystick_controller = JoystickController(client_socket, send_lock)
-    joystick_controller.start()
+    # One event loop (epoll on Linux) handles the TCP status connection,
+    # the UDP video socket and the joystick device, so every event is
+    # handled as soon as it arrives instead of after a sleep.
+    # For the lowest latency, also pin the NIC's IRQ to a core close to
+    # the one running this process.
+    video_receiver = VideoReceiver(args.video_port, reduced=args.reduced_video)
+    video_receiver.start(loop)
+    status_receiver = StatusReceiver(reader)
+    joystick_controller = JoystickController(writer)
+    tasks = [asyncio.create_task(status_receiver.run())]
+    if joystick_controller.start(loop):
+        tasks.append(asyncio.create_task(joystick_controller.run()))
+    # The event loop runs the joystick and status handling: keep it on
+    # CPU 0 with real-time priority so video decoding cannot add jitter.
+    # Pinned only now so the decode thread does not inherit these settings.
+    pin_current_thread({0}, fifo_priority=10, tag="[Client]")
     try:
-        # Wait for threads to finish (they run until program exit)
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\n[Client] Keyboard interrupt received; shutting down")
+        # Stop when the server disconnects or the joystick quits
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
     finally:
-        # Stop all threads
-        joystick_controller.stop()
-        status_receiver.stop()
-        video_receiver.stop()
+        for task in tasks:
+            task.cancel()
+        joystick_controller.close()
+        video_receiver.close()
         # Send quit command to server
         try:
-            quit_msg = {"cmd": "quit"}
-            with send_lock:
-                client_socket.sendall(json.dumps(quit_msg).encode('utf-8') + b"\n")
+            writer.write(_HDR.pack(CMD_QUIT, 0, 0.0, 0.0))
+            await asyncio.wait_for(writer.drain(), 1.0)
         except Exception:
             pass
         # Close socket
-        client_socket.close()
-        # Wait for threads to finish
-        joystick_controller.join(timeout=1.0)
-        status_receiver.join(timeout=1.0)
-        video_receiver.join(timeout=1.0)
+        writer.close()
         print("[Client] Closed connection and cleaned up")
 
 
+def main() -> None:
+    args = parse_args()
+    if sys.platform == 'win32':
+        # The proactor loop has no add_reader(); sockets work with select()
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    try:
+        asyncio.run(run_client(args))
+    except KeyboardInterrupt:
+        print("\n[Client] Keyboard interrupt received; shutting down")
+
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,10 +1,72 @@
+import glob
+import selectors
 import socket
-import keyboard
 import time
 
+from tuning import tune_control_socket
+
+try:
+    from evdev import InputDevice, ecodes  # Linux: lê o teclado direto de /dev/input
+except ImportError:
+    InputDevice = None
+
 HOST = '192.168.11.200'  # IP do Raspberry Pi
 PORT = 8000
 
+# === Teclado ===
+# No Linux o teclado é lido via evdev (basta pertencer ao grupo "input",
+# sem root) e o loop só acorda quando uma tecla muda de estado.  Sem evdev
+# ou sem teclado em /dev/input/by-id, usa a biblioteca keyboard (polling).
+teclado = None
+if InputDevice is not None:
+    dispositivos = sorted(glob.glob('/dev/input/by-id/*-event-kbd'))
+    if dispositivos:
+        teclado = InputDevice(dispositivos[0])
+if teclado is None:
+    import keyboard
+else:
+    TECLAS = {'a': ecodes.KEY_A, 'd': ecodes.KEY_D, 'w': ecodes.KEY_W, 's': ecodes.KEY_S}
+    pressionadas = set()
+    seletor = selectors.DefaultSelector()
+    seletor.register(teclado, selectors.EVENT_READ)
+
+
+def pressionada(tecla):
+    if teclado is None:
+        return keyboard.is_pressed(tecla)
+    return TECLAS[tecla] in pressionadas
+
+
+def aguardar(timeout):
+    """Espera `timeout` segundos atualizando as teclas pressionadas.
+
+    Com evdev e `timeout` None, bloqueia até alguma tecla mudar de estado.
+    """
+    if teclado is None:
+        time.sleep(timeout if timeout is not None else 0.05)
+        return
+    limite = None if timeout is None else time.monotonic() + timeout
+    while True:
+        restante = None if limite is None else max(0.0, limite - time.monotonic())
+        mudou = False
+        if seletor.select(restante):
+            for evento in teclado.read():
+                if evento.type != ecodes.EV_KEY:
+                    continue
+                # value: 1 = pressionada, 0 = solta, 2 = repetição automática (ignorada)
+                if evento.value == 1:
+                    pressionadas.add(evento.code)
+                    mudou = True
+                elif evento.value == 0:
+                    pressionadas.discard(evento.code)
+                    mudou = True
+        if limite is None:
+            if mudou:
+                return
+        elif time.monotonic() >= limite:
+            return
+
+
 # === Estado ===
 potencia = 0
 ultima_potencia_enviada = -1
@@ -13,32 +75,37 @@ direcao_anterior = None
 
 # === Conexão ===
 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+# Envia cada comando imediatamente (sem Nagle) e detecta queda do Wi-Fi
+tune_control_socket(sock)
 sock.connect((HOST, PORT))
 print("Conectado ao carrinho! Use W/S para acelerar/re, A/D para direção.")
 
 try:
     while True:
+        # Comandos desta iteração são acumulados e enviados num único sendall
+        saida = bytearray()
+
         # ===== DIREÇÃO =====
-        if keyboard.is_pressed('a'):
+        if pressionada('a'):
             if direcao_anterior != 'A':
-                sock.sendall(b'A')
+                saida += b'A'
                 direcao_anterior = 'A'
                 print(">> Virando esquerda")
-        elif keyboard.is_pressed('d'):
+        elif pressionada('d'):
             if direcao_anterior != 'D':
-                sock.sendall(b'D')
+                saida += b'D'
                 direcao_anterior = 'D'
                 print(">> Virando direita")
         else:
             if direcao_anterior is not None:
-                sock.sendall(b'N')  # comando neutro ao soltar tecla
+                saida += b'N'  # comando neutro ao soltar tecla
                 print(">> Direção parada")
                 direcao_anterior = None
 
         # ===== ACELERAÇÃO =====
-        if keyboard.is_pressed('w'):
+        if pressionada('w'):
             if modo != 'W':
-                sock.sendall(b'W')
+                saida += b'W'
                 print(">> Modo frente")
                 modo = 'W'
                 potencia = 10
@@ -48,15 +115,15 @@ try:
                     potencia = 100
 
             if potencia != ultima_potencia_enviada:
-                sock.sendall(str(potencia // 10).encode())
+                saida += str(potencia // 10).encode()
                 ultima_potencia_enviada = potencia
                 print(f">> Potência: {potencia}%")
 
-            time.sleep(0.1)
+            espera = 0.1
 
-        elif keyboard.is_pressed('s'):
+        elif pressionada('s'):
             if modo != 'S':
-                sock.sendall(b'S')
+                saida += b'S'
                 print(">> Modo ré")
                 modo = 'S'
                 potencia = 10
@@ -66,23 +133,26 @@ try:
                     potencia = 100
 
             if potencia != ultima_potencia_enviada:
-                sock.sendall(str(potencia // 10).encode())
+                saida += str(potencia // 10).encode()
                 ultima_potencia_enviada = potencia
                 print(f">> Potência ré: {potencia}%")
 
-            time.sleep(0.1)
+            espera = 0.1
 
         else:
             if modo:
-                sock.sendall(b'P')
+                saida += b'P'
                 print(">> Parando motor")
                 potencia = 0
                 ultima_potencia_enviada = -1
                 modo = None
-            time.sleep(0.05)
+            espera = None  # nada acelerando: espera a próxima tecla
+
+        if saida:
+            sock.sendall(bytes(saida))
+        aguardar(espera)
 
 except KeyboardInterrupt:
-    sock.sendall(b'P')
-    sock.sendall(b'N')
+    sock.sendall(b'PN')
     sock.close()
     print("\nConexão encerrada.")
@@ -1,14 +1,13 @@
-import socket
-import time
+import asyncio
 
 IP_SERVIDOR = "192.168.11.200"
 PORTA_COMANDO = 8000
 
-def main():
+async def enviar_comandos():
+    writer = None
     try:
-        tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         print(f"Conectando a {IP_SERVIDOR}:{PORTA_COMANDO}...")
-        tcp.connect((IP_SERVIDOR, PORTA_COMANDO))
+        _, writer = await asyncio.open_connection(IP_SERVIDOR, PORTA_COMANDO)
         print("Conectado!")
 
         comandos = ["frente", "direita", "esquerda", "re", "parar"]
@@ -17,16 +16,24 @@ def main():
         while True:
             cmd = comandos[idx % len(comandos)]
             print(f"Enviando comando: {cmd}")
-            tcp.sendall(cmd.encode())
+            writer.write(cmd.encode())
+            # Espera o buffer esvaziar sem bloquear a thread
+            await writer.drain()
             idx += 1
-            time.sleep(1)
+            await asyncio.sleep(1)
 
     except Exception as e:
         print(f"Erro: {e}")
     finally:
-        tcp.close()
+        if writer is not None:
+            writer.close()
         print("Conexão fechada.")
 
+def main():
+    try:
+        asyncio.run(enviar_comandos())
+    except KeyboardInterrupt:
+        pass
+
 if __name__ == "__main__":
     main()
-
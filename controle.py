@@ -6,9 +6,13 @@ running an AI model).  It establishes a TCP connection to the Raspberry Pi
 server, registers a UDP port for receiving video, and reads input from a
 PlayStation 5 DualSense controller (or any other joystick recognised by
 pygame).  Joystick values are translated into car control commands and
-sent as JSON messages over the TCP connection.  A background thread
-receives JPEG‑encoded video frames via UDP, decodes them with OpenCV
-and displays them in a simple window.
+sent as newline‑delimited JSON messages over the TCP connection.  This
+client only works with ``servidor.py``: ``raspi_server.py`` speaks the
+binary protocol of ``central_client.py`` and closes connections that
+start with a JSON message.  A background thread
+receives JPEG‑encoded video frames via UDP, reassembles them from their
+fragments (see ``servidor.py``), decodes them with OpenCV and displays
+them in a simple window.
 
 The Keyestudio Smart Car documentation suggests using TCP for control
 commands and UDP for video streaming【170506542320415†L50-L55】.  Control commands
@@ -17,11 +21,12 @@ occasional loss and benefit from lower latency.
 
 Usage example::
 
-    python3 central_client.py --server_ip 192.168.1.100 --server_port 5051 --video_port 6000
+    python3 controle.py --server_ip 192.168.1.100 --server_port 5051 --video_port 6000
 
 Dependencies:
     * pygame (for joystick input)
     * opencv-python (for video decoding and display)
+    * av (optional; only for ``--codec h264``)
 
 Install these on your machine via pip if necessary::
 
@@ -32,6 +37,7 @@ Install these on your machine via pip if necessary::
 import argparse
 import json
 import socket
+import struct
 import threading
 import time
 from typing import Optional, Tuple
@@ -48,17 +54,46 @@ try:
 except ImportError:
     pygame = None  # type: ignore
 
+try:
+    import av  # type: ignore
+except ImportError:
+    av = None  # type: ignore  # PyAV is only needed for --codec h264
+
+# Video datagram header: frame id, chunk index, chunk count.  Must match
+# the sender in servidor.py.
+_FRAG_HDR = struct.Struct('!IHH')
+_VIDEO_RCVBUF = 32 * 1024 * 1024
+
 
 class VideoReceiver(threading.Thread):
-    """Thread that receives JPEG frames over UDP and displays them."""
+    """Thread that receives JPEG frames over UDP and displays them.
+
+    Each frame arrives split into datagrams prefixed with ``_FRAG_HDR``.
+    Only one frame is assembled at a time: a chunk of a newer frame drops
+    whatever is left of an incomplete older one.
 
-    def __init__(self, udp_port: int) -> None:
+    With ``codec="h264"`` the frames are H.264 access units (see
+    ``servidor.py --codec h264``), decoded by one reused PyAV context.
+    """
+
+    def __init__(self, udp_port: int, codec: str = "jpeg") -> None:
         super().__init__(daemon=True)
         self.udp_port = udp_port
+        self.decoder = None
+        if codec == "h264":
+            if av is None:
+                print("[VideoReceiver] PyAV not available; cannot decode H.264")
+            else:
+                self.decoder = av.CodecContext.create("h264", "r")
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _VIDEO_RCVBUF)
         # Bind to all interfaces on the given port
         self.sock.bind(("", udp_port))
         self.running = True
+        # Reassembly state for the frame in progress
+        self._frame_id: Optional[int] = None
+        self._chunks: list = []
+        self._missing = 0
         # Frame display toggle; disable GUI on headless systems where DISPLAY is not set.
         import os
         self.display = (cv2 is not None) and bool(os.environ.get('DISPLAY'))
@@ -69,6 +104,29 @@ class VideoReceiver(threading.Thread):
                 # Failed to create a window; disable display
                 self.display = False
 
+    def _reassemble(self, packet: bytes) -> Optional[bytes]:
+        """Store one fragment; returns the JPEG once the frame is complete."""
+        if len(packet) < _FRAG_HDR.size:
+            return None
+        frame_id, idx, count = _FRAG_HDR.unpack_from(packet)
+        if frame_id != self._frame_id:
+            if self._frame_id is not None and (self._frame_id - frame_id) & 0xFFFFFFFF < 64:
+                # Late fragment of a frame that was already dropped; ids
+                # further back mean the server restarted its counter
+                return None
+            self._frame_id = frame_id
+            self._chunks = [None] * count
+            self._missing = count
+        if idx >= len(self._chunks) or self._chunks[idx] is not None:
+            return None
+        self._chunks[idx] = packet[_FRAG_HDR.size:]
+        self._missing -= 1
+        if self._missing:
+            return None
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
     def run(self) -> None:
         if np is None or cv2 is None:
             print("[VideoReceiver] numpy/cv2 not available; cannot decode frames")
@@ -76,11 +134,22 @@ class VideoReceiver(threading.Thread):
         print(f"[VideoReceiver] Listening for video on UDP port {self.udp_port}")
         while self.running:
             try:
-                data, _ = self.sock.recvfrom(65536)
+                packet, _ = self.sock.recvfrom(65536)
+                data = self._reassemble(packet)
                 if not data:
                     continue
-                np_data = np.frombuffer(data, dtype=np.uint8)
-                frame = cv2.imdecode(np_data, cv2.IMREAD_COLOR)
+                if self.decoder is not None:
+                    frame = None
+                    try:
+                        for decoded in self.decoder.decode(av.Packet(data)):
+                            frame = decoded.to_ndarray(format='bgr24')
+                    except av.error.InvalidDataError:
+                        # P-frames before the first keyframe or after a lost
+                        # frame cannot be decoded; wait for the next keyframe
+                        continue
+                else:
+                    np_data = np.frombuffer(data, dtype=np.uint8)
+                    frame = cv2.imdecode(np_data, cv2.IMREAD_COLOR)
                 if frame is None:
                     continue
                 # Display the frame
@@ -204,16 +273,22 @@ class StatusReceiver(threading.Thread):
         self.running = True
 
     def run(self) -> None:
-        buffer = b""
+        # A bytearray is extended in place and consumed from the front, so
+        # back-to-back messages do not re-copy the unread tail.
+        buffer = bytearray()
         while self.running:
             try:
                 data = self.client_socket.recv(4096)
                 if not data:
                     break
-                buffer += data
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
-                    if not line:
+                buffer.extend(data)
+                while True:
+                    idx = buffer.find(b"\n")
+                    if idx < 0:
+                        break
+                    line = bytes(buffer[:idx])
+                    del buffer[:idx + 1]
+                    if not line.strip():
                         continue
                     try:
                         msg = json.loads(line.decode('utf-8'))
@@ -237,6 +312,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--server_ip', required=True, help='IP address of the Raspberry Pi server')
     parser.add_argument('--server_port', type=int, default=5051, help='TCP port of the Raspberry Pi server')
     parser.add_argument('--video_port', type=int, default=6000, help='Local UDP port to receive video')
+    parser.add_argument('--codec', choices=('jpeg', 'h264'), default='jpeg',
+                        help='Video codec; must match the server\'s --codec')
     return parser.parse_args()
 
 
@@ -253,7 +330,7 @@ def main() -> None:
     client_socket.sendall(json.dumps(register_msg).encode('utf-8') + b"\n")
     print(f"[Client] Requested video stream on UDP port {args.video_port}")
     # Start video receiver
-    video_receiver = VideoReceiver(args.video_port)
+    video_receiver = VideoReceiver(args.video_port, codec=args.codec)
     video_receiver.start()
     # Start status receiver
     status_receiver = StatusReceiver(client_socket, send_lock)
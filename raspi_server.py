@@ -11,28 +11,46 @@ Design notes:
   HOWTO notes that TCP (stream) sockets provide better behaviour and
   performance for most applications than alternatives【331489574117605†L71-L77】.  Using
   TCP for control ensures that commands arrive in order and without loss.
-* A simple JSON‑based protocol is used for control messages.  Each message
-  must contain at least a ``cmd`` key.  Supported commands include::
-
-    {"cmd": "register_video", "video_port": 6000}
-        Register the client’s IP address and UDP port for receiving video
-        frames.  Only one client can be registered at a time.  Once
-        registered, the server will begin streaming camera frames via
-        UDP to ``(client_ip, video_port)``.
-
-    {"cmd": "move", "direction": "forward", "speed": 0.6, "steering": -0.2}
-        Move the car.  ``direction`` should be ``"forward"`` or
-        ``"backward"``.  ``speed`` is a float in the range [0, 1].  ``steering``
+* Control messages use a compact binary protocol.  Every message starts
+  with a one‑byte command id.  The frequent commands are fixed‑size
+  10‑byte frames ``struct.pack('<BBff', cmd_id, dir_id, speed, steering)``,
+  so the server never has to search for delimiters or parse text::
+
+    CMD_MOVE (1), dir_id, speed, steering
+        Move the car.  ``dir_id`` is 1 for forward and 2 for backward
+        (0 stops).  ``speed`` is a float in the range [0, 1].  ``steering``
         is a float in the range [-1, 1], where negative values steer left
         and positive values steer right.  Implementation of motor control
         is left as a stub and should be adapted to your hardware.
 
-    {"cmd": "stop"}
+    CMD_STOP (2)
         Stop the car.  This resets speed and steering to zero.
 
-    {"cmd": "quit"}
+    CMD_QUIT (3)
         Cleanly shut down the server.
 
+    CMD_STATUS (5)
+        Request a status message.  The server answers with a msgpack map
+        ``{"battery": ..., "speed": ..., "steering": ...}`` preceded by its
+        length as ``struct.pack('!H', len(payload))``.
+
+  Only the once‑per‑session video registration still carries JSON, framed
+  as ``struct.pack('<BH', CMD_REGVIDEO, len(payload)) + payload``::
+
+    CMD_REGVIDEO (4), {"cmd": "register_video", "video_port": 6000}
+        Register the client’s IP address and UDP port for receiving video
+        frames.  Only one client can be registered at a time.  Once
+        registered, the server will begin streaming camera frames via
+        UDP to ``(client_ip, video_port)``.
+
+  The JSON payload may also carry any of the other commands, e.g.
+  ``{"cmd": "move", "direction": "forward", "speed": 0.6, "steering": -0.2}``.
+
+  Only ``central_client.py`` speaks this protocol.  ``controle.py`` and
+  ``servidor.py`` exchange newline‑delimited JSON instead, so the two
+  client/server pairs are not interchangeable; a connection whose first
+  byte is ``{`` comes from ``controle.py`` and is closed.
+
 * Once a client has registered a video port, a dedicated thread will
   capture frames from the Raspberry Pi camera using OpenCV (``cv2``) and
   transmit them over UDP.  The Keyestudio Smart Car documentation
@@ -40,12 +58,21 @@ Design notes:
   because UDP has lower overhead【170506542320415†L50-L55】.  Frames are resized
   to 320×240 and JPEG‑encoded to reduce the datagram size.  JPEG quality
   and frame size can be adjusted to balance latency and bandwidth.
+  When ``picamera2`` is installed, frames are captured at 320×240 by the
+  ISP and JPEG‑encoded by the VideoCore hardware encoder, so no CPU time
+  is spent on resizing or encoding.  Otherwise OpenCV is used, which
+  should be built against libjpeg‑turbo for SIMD‑accelerated encoding.
+* Each JPEG frame is split into datagrams of at most 1400 payload bytes so
+  that no datagram exceeds the Wi‑Fi MTU and gets fragmented by the IP
+  layer.  Every datagram starts with an 8‑byte header
+  ``struct.pack('!IHH', frame_id, chunk_index, chunk_count)``; the client
+  reassembles frames by ``frame_id`` and drops incomplete ones.
 
 To run this script on your Raspberry Pi, first install the required
 dependencies::
 
     sudo apt update
-    sudo apt install python3-opencv python3-pygame
+    sudo apt install python3-opencv python3-pygame python3-picamera2 python3-msgpack
 
 Then invoke the script.  By default it binds the TCP server to all
 interfaces on port 5051.  You can override the host and port with
@@ -57,16 +84,50 @@ command‑line arguments (see ``--help``)::
 
 import argparse
 import json
+import math
+import queue
 import socket
+import struct
 import threading
 import time
 from typing import Optional, Tuple
 
+import msgpack  # type: ignore
+
 try:
     import cv2  # type: ignore
 except ImportError:
     cv2 = None  # OpenCV is optional; images will not be streamed if unavailable
 
+try:
+    from picamera2 import Picamera2  # type: ignore
+    from picamera2.encoders import MJPEGEncoder  # type: ignore
+    from picamera2.outputs import Output  # type: ignore
+except ImportError:
+    Picamera2 = None  # type: ignore
+    Output = object  # type: ignore
+
+from tuning import tune_control_socket
+
+# Video datagram header: frame id, chunk index, chunk count.  Must match
+# the receiver in central_client.py.
+_FRAG_HDR = struct.Struct('!IHH')
+_FRAG_PAYLOAD = 1400
+# Room for several worst-case 320×240 frames, so sendmsg never blocks
+_VIDEO_SNDBUF = 262144
+
+# Control protocol.  Must match central_client.py.
+CMD_MOVE = 1
+CMD_STOP = 2
+CMD_QUIT = 3
+CMD_REGVIDEO = 4
+CMD_STATUS = 5
+DIRECTIONS = ("stop", "forward", "backward")
+_HDR = struct.Struct('<BBff')
+_JSON_HDR = struct.Struct('<BH')
+# Status responses: big-endian length prefix + msgpack payload
+_STATUS_HDR = struct.Struct('!H')
+
 
 class CarController:
     """Stub class to represent motor control on the Raspberry Pi.
@@ -100,8 +161,24 @@ class CarController:
         self.set_speed_and_steering(0.0, 0.0)
 
 
+class _UDPFrameOutput(Output):
+    """picamera2 output that hands every encoded JPEG frame to a callback."""
+
+    def __init__(self, send_frame) -> None:
+        super().__init__()
+        self.send_frame = send_frame
+
+    def outputframe(self, frame, keyframe=True, timestamp=None, *args, **kwargs) -> None:
+        self.send_frame(frame)
+
+
 class VideoStreamer(threading.Thread):
-    """Thread that captures frames and sends them via UDP."""
+    """Thread that captures frames and sends them via UDP.
+
+    With ``picamera2`` the ISP delivers 320×240 frames directly and the
+    VideoCore hardware JPEG encoder is used when available; OpenCV
+    capture, resize and ``cv2.imencode`` are the fallback.
+    """
 
     def __init__(self, udp_socket: socket.socket, get_client_addr, frame_rate: float = 20.0) -> None:
         super().__init__(daemon=True)
@@ -110,44 +187,179 @@ class VideoStreamer(threading.Thread):
         self.frame_interval = 1.0 / frame_rate
         self.running = True
         self.cap: Optional[cv2.VideoCapture] = None
+        self.picam2 = None
+        self.use_picamera = Picamera2 is not None
+        self.frame_id = 0
+        # JPEG parameters for cv2.imencode, built once.  Quality can be
+        # adjusted (0-100).  Huffman optimisation and progressive mode are
+        # extra passes over every frame, so both stay off; restart markers
+        # every 8 MCUs let GPU decoders run Huffman decoding in parallel.
+        self._encode_param = [] if cv2 is None else [
+            int(cv2.IMWRITE_JPEG_QUALITY), 50,
+            int(cv2.IMWRITE_JPEG_OPTIMIZE), 0,
+            int(cv2.IMWRITE_JPEG_PROGRESSIVE), 0,
+            int(cv2.IMWRITE_JPEG_RST_INTERVAL), 8,
+        ]
+
+    def send_frame(self, data) -> None:
+        """Send one encoded frame to the registered client, if any.
+
+        The frame is split into ``_FRAG_PAYLOAD``‑sized chunks; header and
+        payload are passed to ``sendmsg`` separately so the payload is
+        never copied into a concatenated datagram.  ``data`` may be any
+        buffer, e.g. the ``ndarray`` returned by ``cv2.imencode``, which is
+        read in place.  The socket is non‑blocking: if its send buffer is
+        full the rest of the frame is dropped rather than delaying the next.
+        """
+        client_addr = self.get_client_addr()
+        if client_addr is None:
+            return
+        view = memoryview(data).cast('B')
+        total = max(1, math.ceil(len(view) / _FRAG_PAYLOAD))
+        frame_id = self.frame_id
+        self.frame_id = (frame_id + 1) & 0xFFFFFFFF
+        try:
+            for idx in range(total):
+                chunk = view[idx * _FRAG_PAYLOAD:(idx + 1) * _FRAG_PAYLOAD]
+                header = _FRAG_HDR.pack(frame_id, idx, total)
+                self.udp_socket.sendmsg([header, chunk], [], 0, client_addr)
+        except BlockingIOError:
+            pass
+        except Exception as e:
+            print(f"[Video] Error sending frame: {e}")
 
     def run(self) -> None:
+        if self.use_picamera:
+            try:
+                self._run_picamera()
+                return
+            except Exception as e:
+                print(f"[Video] picamera2 capture failed ({e}); falling back to OpenCV")
+                if self.picam2 is not None:
+                    self.picam2.close()
+                    self.picam2 = None
+        self._run_opencv()
+
+    def _run_picamera(self) -> None:
+        """Capture 320×240 YUV420 frames scaled by the ISP and stream them.
+
+        With the hardware MJPEG encoder, the encoder thread inside
+        ``picamera2`` calls :meth:`send_frame` for every frame and this
+        thread only waits for :meth:`stop`.  Boards without one (e.g. the
+        Pi 5) encode the captured YUV frames with OpenCV instead; either
+        way no CPU resize is needed.
+        """
+        self.picam2 = Picamera2()
+        config = self.picam2.create_video_configuration(
+            main={"size": (320, 240), "format": "YUV420"},
+            controls={"FrameRate": 1.0 / self.frame_interval},
+        )
+        self.picam2.configure(config)
+        try:
+            encoder = MJPEGEncoder()
+        except Exception as e:
+            if cv2 is None:
+                raise
+            print(f"[Video] Hardware JPEG encoder unavailable ({e}); encoding with OpenCV")
+            encoder = None
+        try:
+            if encoder is not None:
+                self.picam2.start_recording(encoder, _UDPFrameOutput(self.send_frame))
+                print("[Video] Camera opened; streaming with the hardware JPEG encoder")
+                while self.running:
+                    time.sleep(0.5)
+            else:
+                self.picam2.start()
+                print("[Video] Camera opened; starting streaming loop")
+                # capture_array blocks until the next frame, so the camera
+                # paces the capture thread
+                self._stream_pipelined(
+                    lambda: self.picam2.capture_array("main"),
+                    lambda yuv: cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420),
+                    pace=0.0,
+                )
+        finally:
+            if encoder is not None:
+                self.picam2.stop_recording()
+            else:
+                self.picam2.stop()
+            self.picam2.close()
+            self.picam2 = None
+            print("[Video] Streaming thread stopped")
+
+    def _run_opencv(self) -> None:
         if cv2 is None:
             print("[Video] OpenCV not available; video streaming disabled")
             return
+        if "libjpeg-turbo" not in cv2.getBuildInformation():
+            print("[Video] Warning: OpenCV is not built with libjpeg-turbo; JPEG encoding will be slow")
         # Open default camera
         self.cap = cv2.VideoCapture(0)
         if not self.cap.isOpened():
             print("[Video] Failed to open camera; video streaming disabled")
             return
         print("[Video] Camera opened; starting streaming loop")
+
+        def grab():
+            ret, frame = self.cap.read()
+            return frame if ret else None
+
+        # Resize and compress
+        self._stream_pipelined(grab, lambda frame: cv2.resize(frame, (320, 240)),
+                               pace=self.frame_interval)
+        # Cleanup
+        if self.cap is not None:
+            self.cap.release()
+        print("[Video] Streaming thread stopped")
+
+    def _stream_pipelined(self, grab, convert, pace: float) -> None:
+        """Capture in a helper thread while this thread converts, encodes and sends.
+
+        ``grab()`` returns a raw frame (or ``None``) and ``convert(frame)``
+        turns it into a 320×240 BGR frame.  The two stages are linked by a
+        two-slot queue; when the encoder falls behind, the oldest frame is
+        dropped so the camera never stalls and the newest frame is sent.
+        """
+        frames: queue.Queue = queue.Queue(maxsize=2)
+        capturer = threading.Thread(target=self._capture_loop, args=(grab, frames, pace), daemon=True)
+        capturer.start()
+        while self.running:
+            try:
+                frame = frames.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self.encode_and_send(convert(frame))
+        capturer.join()
+
+    def _capture_loop(self, grab, frames: queue.Queue, pace: float) -> None:
         while self.running:
-            client_addr = self.get_client_addr()
-            if client_addr is None:
+            if self.get_client_addr() is None:
                 # No client registered; wait and retry
                 time.sleep(0.5)
                 continue
-            ret, frame = self.cap.read()
-            if not ret:
-                continue
-            # Resize and compress
-            frame_small = cv2.resize(frame, (320, 240))
-            # Encode as JPEG; quality can be adjusted (0-100)
-            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 50]
-            ret, buffer = cv2.imencode('.jpg', frame_small, encode_param)
-            if not ret:
+            frame = grab()
+            if frame is None:
                 continue
-            data = buffer.tobytes()
+            if frames.full():
+                # Drop the stale frame to make room for the new one
+                try:
+                    frames.get_nowait()
+                except queue.Empty:
+                    pass
             try:
-                # Send frame via UDP
-                self.udp_socket.sendto(data, client_addr)
-            except Exception as e:
-                print(f"[Video] Error sending frame: {e}")
-            time.sleep(self.frame_interval)
-        # Cleanup
-        if self.cap is not None:
-            self.cap.release()
-        print("[Video] Streaming thread stopped")
+                frames.put_nowait(frame)
+            except queue.Full:
+                pass
+            if pace:
+                time.sleep(pace)
+
+    def encode_and_send(self, frame) -> None:
+        """JPEG-encode a 320×240 BGR frame with OpenCV and send it."""
+        ret, buffer = cv2.imencode('.jpg', frame, self._encode_param)
+        if not ret:
+            return
+        # Send frame via UDP straight from the encoder's buffer
+        self.send_frame(buffer)
 
     def stop(self) -> None:
         self.running = False
@@ -168,6 +380,8 @@ class CommandServer:
 
         # UDP socket for video streaming
         self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _VIDEO_SNDBUF)
+        self.udp_socket.setblocking(False)
         self.client_video_addr: Optional[Tuple[str, int]] = None
         self.video_streamer = VideoStreamer(self.udp_socket, self.get_client_video_addr)
         self.video_streamer.start()
@@ -181,26 +395,44 @@ class CommandServer:
     def handle_client(self, client_socket: socket.socket, addr: Tuple[str, int]) -> None:
         print(f"[Server] Accepted connection from {addr}")
         try:
-            # We will accumulate data until a newline is found.  Messages are
-            # separated by newlines to make parsing easier.
-            buffer = b""
+            tune_control_socket(client_socket)
+            # controle.py sends newline-delimited JSON (it pairs with
+            # servidor.py); no binary command id is the '{' it starts with
+            if client_socket.recv(1, socket.MSG_PEEK) == b'{':
+                print(f"[Server] {addr} sent JSON text; this server only speaks "
+                      "the binary protocol of central_client.py")
+                return
+            # Binary commands are fixed-size; JSON messages carry their
+            # length, so complete messages are sliced off the front.
+            buffer = bytearray()
             while True:
                 data = client_socket.recv(4096)
                 if not data:
                     print("[Server] Client disconnected")
                     break
                 buffer += data
-                # Process each complete line (message)
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
-                    if not line:
-                        continue
-                    try:
-                        msg = json.loads(line.decode('utf-8'))
-                    except json.JSONDecodeError as e:
-                        print(f"[Server] Failed to decode message: {e}")
-                        continue
-                    self.process_message(msg, client_socket, addr)
+                while buffer:
+                    if buffer[0] == CMD_REGVIDEO:
+                        if len(buffer) < _JSON_HDR.size:
+                            break
+                        _, length = _JSON_HDR.unpack_from(buffer)
+                        end = _JSON_HDR.size + length
+                        if len(buffer) < end:
+                            break
+                        payload = bytes(buffer[_JSON_HDR.size:end])
+                        del buffer[:end]
+                        try:
+                            msg = json.loads(payload.decode('utf-8'))
+                        except json.JSONDecodeError as e:
+                            print(f"[Server] Failed to decode message: {e}")
+                            continue
+                        self.process_message(msg, client_socket, addr)
+                    else:
+                        if len(buffer) < _HDR.size:
+                            break
+                        cmd_id, dir_id, speed, steering = _HDR.unpack_from(buffer)
+                        del buffer[:_HDR.size]
+                        self.process_command(cmd_id, dir_id, speed, steering, client_socket)
         except Exception as e:
             print(f"[Server] Error during client handling: {e}")
         finally:
@@ -210,6 +442,21 @@ class CommandServer:
                 print("[Server] Clearing registered video client")
                 self.client_video_addr = None
 
+    def process_command(self, cmd_id: int, dir_id: int, speed: float, steering: float,
+                        client_socket: socket.socket) -> None:
+        """Handle one fixed-size binary command frame."""
+        if cmd_id == CMD_MOVE:
+            direction = DIRECTIONS[dir_id] if dir_id < len(DIRECTIONS) else "stop"
+            self.move(direction, speed, steering)
+        elif cmd_id == CMD_STOP:
+            self.controller.stop()
+        elif cmd_id == CMD_QUIT:
+            self.quit()
+        elif cmd_id == CMD_STATUS:
+            self.send_status(client_socket)
+        else:
+            print(f"[Server] Unknown command id: {cmd_id}")
+
     def process_message(self, msg: dict, client_socket: socket.socket, addr: Tuple[str, int]) -> None:
         cmd = msg.get("cmd")
         if cmd == "register_video":
@@ -224,32 +471,41 @@ class CommandServer:
             direction = msg.get("direction", "stop")
             speed = float(msg.get("speed", 0.0))
             steering = float(msg.get("steering", 0.0))
-            if direction == "forward":
-                self.controller.set_speed_and_steering(speed, steering)
-            elif direction == "backward":
-                # negative speed might represent backward; convert for stub
-                self.controller.set_speed_and_steering(speed, -steering)
-            else:
-                print(f"[Server] Unknown direction: {direction}")
+            self.move(direction, speed, steering)
         elif cmd == "stop":
             self.controller.stop()
         elif cmd == "quit":
-            print("[Server] Quit command received; shutting down")
-            # Stop video and exit the main loop
-            self.video_streamer.stop()
-            self.server_socket.close()
+            self.quit()
         elif cmd == "status":
-            # Send a status response back to the client
-            status = {
-                "battery": 100,  # placeholder for battery level
-                "speed": self.controller.speed,
-                "steering": self.controller.steering,
-            }
-            resp = json.dumps(status).encode('utf-8') + b"\n"
-            client_socket.sendall(resp)
+            self.send_status(client_socket)
         else:
             print(f"[Server] Unknown command: {cmd}")
 
+    def move(self, direction: str, speed: float, steering: float) -> None:
+        if direction == "forward":
+            self.controller.set_speed_and_steering(speed, steering)
+        elif direction == "backward":
+            # negative speed might represent backward; convert for stub
+            self.controller.set_speed_and_steering(speed, -steering)
+        else:
+            print(f"[Server] Unknown direction: {direction}")
+
+    def quit(self) -> None:
+        print("[Server] Quit command received; shutting down")
+        # Stop video and exit the main loop
+        self.video_streamer.stop()
+        self.server_socket.close()
+
+    def send_status(self, client_socket: socket.socket) -> None:
+        # Send a status response back to the client
+        status = {
+            "battery": 100,  # placeholder for battery level
+            "speed": self.controller.speed,
+            "steering": self.controller.steering,
+        }
+        payload = msgpack.packb(status)
+        client_socket.sendall(_STATUS_HDR.pack(len(payload)) + payload)
+
     def serve_forever(self) -> None:
         try:
             while True:
@@ -7,7 +7,9 @@ socket to stream compressed camera frames back to the central computer.
 Design notes:
 
 * The server listens for a single TCP connection from a client.  All control
-  messages are sent over this reliable connection.  The Python socket
+  messages are sent over this reliable connection.  Connections are served
+  by an ``asyncio`` event loop on a single thread rather than one thread
+  per client, since the control channel is pure I/O.  The Python socket
   HOWTO notes that TCP (stream) sockets provide better behaviour and
   performance for most applications than alternatives【331489574117605†L71-L77】.  Using
   TCP for control ensures that commands arrive in order and without loss.
@@ -33,19 +35,35 @@ Design notes:
     {"cmd": "quit"}
         Cleanly shut down the server.
 
-* Once a client has registered a video port, a dedicated thread will
-  capture frames from the Raspberry Pi camera using OpenCV (``cv2``) and
-  transmit them over UDP.  The Keyestudio Smart Car documentation
-  recommends using UDP for video streaming while using TCP for control
-  because UDP has lower overhead【170506542320415†L50-L55】.  Frames are resized
-  to 320×240 and JPEG‑encoded to reduce the datagram size.  JPEG quality
-  and frame size can be adjusted to balance latency and bandwidth.
+  Every message is terminated by a newline.  Only ``controle.py`` speaks
+  this protocol.  ``central_client.py`` and ``raspi_server.py`` exchange
+  binary frames instead, so the two client/server pairs are not
+  interchangeable; a connection whose first byte is neither ``{`` nor
+  whitespace comes from ``central_client.py`` and is closed.
+
+* Once a client has registered a video port, a dedicated process will
+  capture frames from the Raspberry Pi camera and transmit them over UDP.
+  The Keyestudio Smart Car documentation recommends using UDP for video
+  streaming while using TCP for control because UDP has lower
+  overhead【170506542320415†L50-L55】.  Frames are captured at 320×240
+  (scaled by the ISP with ``picamera2``, or requested from the camera
+  driver with OpenCV) and compressed to keep the datagrams small.  By
+  default every frame is JPEG‑encoded: by the VideoCore hardware encoder
+  with ``picamera2``, otherwise with libjpeg‑turbo through ``PyTurboJPEG``
+  when it is installed (SIMD DCT on the Pi's NEON unit) or with
+  ``cv2.imencode``.  Software JPEG quality adapts to the time left in
+  each frame interval.  ``--codec h264`` streams H.264 instead (via
+  ``PyAV``, using the Pi's V4L2 hardware encoder or libx264), which needs
+  far less bandwidth than a JPEG per frame; the client must be started
+  with ``--codec h264`` too.
 
 To run this script on your Raspberry Pi, first install the required
 dependencies::
 
     sudo apt update
-    sudo apt install python3-opencv python3-pygame
+    sudo apt install python3-opencv python3-pygame python3-picamera2 libturbojpeg0 pigpio python3-pigpio
+    sudo systemctl enable --now pigpiod
+    pip install PyTurboJPEG orjson
 
 Then invoke the script.  By default it binds the TCP server to all
 interfaces on port 5051.  You can override the host and port with
@@ -56,9 +74,15 @@ command‑line arguments (see ``--help``)::
 """
 
 import argparse
+import asyncio
+import fractions
 import json
+import logging
+import math
+import multiprocessing
+import os
 import socket
-import threading
+import struct
 import time
 from typing import Optional, Tuple
 
@@ -67,6 +91,42 @@ try:
 except ImportError:
     cv2 = None  # OpenCV is optional; images will not be streamed if unavailable
 
+try:
+    from turbojpeg import TJPF_BGR, TJSAMP_420, TurboJPEG  # type: ignore
+except ImportError:
+    TurboJPEG = None  # PyTurboJPEG is optional; cv2.imencode is used instead
+
+try:
+    from picamera2 import Picamera2  # type: ignore
+    from picamera2.encoders import MJPEGEncoder  # type: ignore
+    from picamera2.outputs import Output  # type: ignore
+except ImportError:
+    Picamera2 = None  # type: ignore
+    Output = object  # type: ignore
+
+try:
+    import av  # type: ignore
+except ImportError:
+    av = None  # type: ignore  # PyAV is only needed for --codec h264
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore  # the standard json module is used instead
+
+from tuning import pin_current_thread
+
+# Per-command motor messages go through this logger at DEBUG level, so
+# they cost nothing unless --verbose is given
+log = logging.getLogger("carrinho")
+
+# Video datagram header: frame id, chunk index, chunk count.  Frames are
+# split into chunks of at most _FRAG_PAYLOAD bytes so that no datagram
+# exceeds the Wi-Fi MTU.  Must match the receiver in controle.py.
+_FRAG_HDR = struct.Struct('!IHH')
+_FRAG_PAYLOAD = 1400
+_VIDEO_SNDBUF = 32 * 1024 * 1024
+
 
 class CarController:
     """Control two DC motors via an L298N driver connected to a Raspberry Pi.
@@ -78,10 +138,13 @@ class CarController:
     direction controlled by IN3/IN4.  When not steering, Motor B is
     stopped to avoid unnecessary current draw.
 
-    Because the code runs on a Raspberry Pi, it depends on the
-    ``RPi.GPIO`` package.  If running off‑hardware (for example, in a
-    development environment), GPIO operations are skipped and log
-    messages are printed instead.
+    Because the code runs on a Raspberry Pi, it drives the pins through
+    the ``pigpio`` daemon when ``pigpiod`` is running: its PWM is timed
+    by DMA instead of a Python thread, so it does not jitter while the
+    video thread is busy.  Otherwise the ``RPi.GPIO`` package (software
+    PWM) is used.  If running off‑hardware (for example, in a development
+    environment), GPIO operations are skipped and log messages are
+    printed instead.
     """
 
     def __init__(self,
@@ -96,13 +159,47 @@ class CarController:
             'IN1': in1, 'IN2': in2, 'ENA': ena,
             'IN3': in3, 'IN4': in4, 'ENB': enb,
         }
+        # Plain attributes for the per-command path, avoiding dict lookups
+        self._in1, self._in2, self._in3, self._in4 = in1, in2, in3, in4
+        self._ena, self._enb = ena, enb
+        # Logic levels; replaced by RPi.GPIO's constants when it is used
+        self._HI, self._LO = 1, 0
         self.freq = freq
         self.speed = 0.0
         self.steering = 0.0
+        # Last (forward, duty %) applied to each motor; repeated commands
+        # with the same state skip the GPIO writes entirely
+        self._last_a: Tuple[Optional[bool], Optional[float]] = (None, None)
+        self._last_b: Tuple[Optional[bool], Optional[float]] = (None, None)
+        self.pi = None
+        self.GPIO = None  # type: ignore
+        self.gpio_available = False
+        self.pwm_a = None  # type: ignore
+        self.pwm_b = None  # type: ignore
+        # Prefer the pigpio daemon for hardware-timed PWM
+        try:
+            import pigpio  # type: ignore
+            pi = pigpio.pi()
+            if not pi.connected:
+                pi.stop()
+                raise RuntimeError("pigpiod is not running")
+            for pin_name, pin in self.pins.items():
+                if 'EN' in pin_name:
+                    pi.set_PWM_frequency(pin, self.freq)
+                    pi.set_PWM_dutycycle(pin, 0)
+                else:
+                    pi.set_mode(pin, pigpio.OUTPUT)
+            self.pi = pi
+            self.gpio_available = True
+            print(f"[Motor] pigpio initialised using pins: {self.pins}")
+            return
+        except Exception as e:
+            print(f"[Motor] pigpio not available: {e}; trying RPi.GPIO")
         # Attempt to import RPi.GPIO; if unavailable, use a mock
         try:
             import RPi.GPIO as GPIO  # type: ignore
             self.GPIO = GPIO
+            self._HI, self._LO = GPIO.HIGH, GPIO.LOW
             self.gpio_available = True
             self.GPIO.setmode(self.GPIO.BCM)
             # Setup motor control pins
@@ -144,17 +241,17 @@ class CarController:
         duty_loco = abs(speed)
         if duty_loco < 1e-2:
             # Stop locomotion motor
-            self._set_motor(self.pins['IN1'], self.pins['IN2'], 0.0, forward=True)
+            self._set_motor(self._in1, self._in2, 0.0, forward=True)
         else:
-            self._set_motor(self.pins['IN1'], self.pins['IN2'], duty_loco, forward=locomotion_forward)
+            self._set_motor(self._in1, self._in2, duty_loco, forward=locomotion_forward)
         # Steering control
         if abs(steering) < 1e-2:
-            self._set_motor(self.pins['IN3'], self.pins['IN4'], 0.0, forward=True)
+            self._set_motor(self._in3, self._in4, 0.0, forward=True)
         else:
             steering_forward = steering > 0
             duty_steer = abs(steering)
-            self._set_motor(self.pins['IN3'], self.pins['IN4'], duty_steer, forward=steering_forward)
-        print(f"[Motor] speed={speed:.2f} steering={steering:.2f}")
+            self._set_motor(self._in3, self._in4, duty_steer, forward=steering_forward)
+        log.debug("[Motor] speed=%.2f steering=%.2f", speed, steering)
 
     def _set_motor(self, in_pin1: int, in_pin2: int, duty: float, forward: bool) -> None:
         """Low‑level helper to set a motor's direction and PWM duty cycle.
@@ -169,42 +266,311 @@ class CarController:
             If True, sets IN1 high and IN2 low; else reversed.
         """
         duty = max(0.0, min(1.0, duty))
-        if not self.gpio_available:
-            print(f"[Motor] (sim) {'forward' if forward else 'reverse'} duty {duty:.2f} on pins {in_pin1},{in_pin2}")
+        locomotion = in_pin1 == self._in1
+        new_state = (forward, round(duty * 100, 1))
+        if new_state == (self._last_a if locomotion else self._last_b):
             return
-        # Set direction
-        if forward:
-            self.GPIO.output(in_pin1, self.GPIO.HIGH)
-            self.GPIO.output(in_pin2, self.GPIO.LOW)
+        if locomotion:
+            self._last_a = new_state
         else:
-            self.GPIO.output(in_pin1, self.GPIO.LOW)
-            self.GPIO.output(in_pin2, self.GPIO.HIGH)
+            self._last_b = new_state
+        if not self.gpio_available:
+            log.debug("[Motor] (sim) %s duty %.2f on pins %d,%d",
+                      'forward' if forward else 'reverse', duty, in_pin1, in_pin2)
+            return
+        hi, lo = self._HI, self._LO
+        if self.pi is not None:
+            self.pi.write(in_pin1, hi if forward else lo)
+            self.pi.write(in_pin2, lo if forward else hi)
+            # pigpio duty cycles range from 0 to 255 by default
+            self.pi.set_PWM_dutycycle(self._ena if locomotion else self._enb, int(duty * 255))
+            return
+        # Set direction with a single call for both H-bridge inputs
+        self.GPIO.output([in_pin1, in_pin2], (hi, lo) if forward else (lo, hi))
         # Determine which PWM to use based on IN pins
-        if in_pin1 in (self.pins['IN1'], self.pins['IN2']):
+        if locomotion:
             # Locomotion PWM
-            self.pwm_a.ChangeDutyCycle(duty * 100)
+            self.pwm_a.ChangeDutyCycle(new_state[1])
         else:
             # Steering PWM
-            self.pwm_b.ChangeDutyCycle(duty * 100)
+            self.pwm_b.ChangeDutyCycle(new_state[1])
 
     def stop(self) -> None:
         """Stop both motors."""
         self.set_speed_and_steering(0.0, 0.0)
-        print("[Motor] stop() called")
+        log.debug("[Motor] stop() called")
+
 
+class _UDPFrameOutput(Output):
+    """picamera2 output that hands every encoded JPEG frame to a callback."""
 
-class VideoStreamer(threading.Thread):
-    """Thread that captures frames and sends them via UDP."""
+    def __init__(self, send_frame) -> None:
+        super().__init__()
+        self.send_frame = send_frame
 
-    def __init__(self, udp_socket: socket.socket, get_client_addr, frame_rate: float = 20.0) -> None:
+    def outputframe(self, frame, keyframe=True, timestamp=None, *args, **kwargs) -> None:
+        self.send_frame(frame)
+
+
+class VideoStreamer(multiprocessing.Process):
+    """Process that captures frames and sends them via UDP.
+
+    With ``picamera2`` the ISP delivers 320×240 frames and the VideoCore
+    hardware JPEG encoder compresses them.  Otherwise frames are captured
+    with OpenCV and encoded with libjpeg‑turbo (``PyTurboJPEG``) when
+    available or ``cv2.imencode``.
+
+    Running in its own process keeps capture and encoding off the GIL of
+    the control loop.  The parent publishes the client address with
+    :meth:`set_client_addr` through shared memory and an event; the UDP
+    socket and encoder are created in the child.
+    """
+
+    def __init__(self, frame_rate: float = 20.0, codec: str = "jpeg") -> None:
         super().__init__(daemon=True)
-        self.udp_socket = udp_socket
-        self.get_client_addr = get_client_addr  # Callable returning (ip, port)
         self.frame_interval = 1.0 / frame_rate
-        self.running = True
+        self.codec = codec
+        # Client address shared with the parent as b"ip:port" (empty: none).
+        # Sized for the longest IPv6 text form (45 chars) plus ":65535"
+        self._addr = multiprocessing.Array('c', 64)
+        self._addr_changed = multiprocessing.Event()
+        self._stopped = multiprocessing.Event()
+        self._client_addr: Optional[Tuple[str, int]] = None
+        self.udp_socket: Optional[socket.socket] = None
         self.cap: Optional[cv2.VideoCapture] = None
+        self.picam2 = None
+        self.frame_id = 0
+        # Fragment header, rewritten in place for every datagram
+        self._frag_header = bytearray(_FRAG_HDR.size)
+        # JPEG quality (0-100); adjusted between 20 and 70 at run time so
+        # that encoding and sending fit in the frame interval
+        self.jpeg_quality = 50
+        self.encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality] if cv2 is not None else []
+        self.tj = None
+        # H.264 encoder state (``codec="h264"``), reused for every frame
+        self.h264 = None
+        self._av_frame = None
+        self._yuv = None
+        self._pts = 0
+
+    @property
+    def running(self) -> bool:
+        return not self._stopped.is_set()
+
+    def set_client_addr(self, addr: Optional[Tuple[str, int]]) -> None:
+        """Called in the parent: stream to ``addr`` from now on, or stop."""
+        with self._addr.get_lock():
+            self._addr.value = f"{addr[0]}:{addr[1]}".encode() if addr else b""
+        self._addr_changed.set()
+
+    def get_client_addr(self) -> Optional[Tuple[str, int]]:
+        """Called in the child: the current client address, if any."""
+        if self._addr_changed.is_set():
+            self._addr_changed.clear()
+            with self._addr.get_lock():
+                value = self._addr.value.decode()
+            if value:
+                ip, port = value.rsplit(":", 1)
+                self._client_addr = (ip, int(port))
+            else:
+                self._client_addr = None
+        return self._client_addr
+
+    def _init_encoder(self) -> None:
+        if self.codec == "h264":
+            if av is None:
+                print("[Video] PyAV not available; streaming JPEG instead of H.264")
+            elif self._init_h264():
+                return
+            else:
+                print("[Video] No H.264 encoder available; streaming JPEG instead")
+            self.codec = "jpeg"
+        if TurboJPEG is not None:
+            try:
+                self.tj = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                # The Python wrapper is installed but libturbojpeg is not
+                # (depending on the PyTurboJPEG version this is either error)
+                print(f"[Video] libturbojpeg not available ({e}); using cv2.imencode")
+
+    def _init_h264(self) -> bool:
+        """Open the Pi's V4L2 hardware H.264 encoder, or libx264 without it.
+
+        One codec context and one ``VideoFrame`` are kept for the whole
+        stream; every frame's I420 planes are copied into that frame.
+        A keyframe is sent every second so the client recovers from lost
+        datagrams.
+        """
+        rate = fractions.Fraction(1.0 / self.frame_interval).limit_denominator(1000)
+        for name in ("h264_v4l2m2m", "libx264"):
+            try:
+                ctx = av.CodecContext.create(name, "w")
+                ctx.width, ctx.height = 320, 240
+                ctx.pix_fmt = "yuv420p"
+                ctx.framerate = rate
+                ctx.time_base = 1 / rate
+                ctx.gop_size = max(1, round(rate))
+                if name == "libx264":
+                    ctx.options = {"tune": "zerolatency", "preset": "ultrafast"}
+                ctx.open()
+            except Exception as e:
+                print(f"[Video] H.264 encoder {name} unavailable: {e}")
+                continue
+            self.h264 = ctx
+            self._av_frame = av.VideoFrame(320, 240, "yuv420p")
+            print(f"[Video] Encoding H.264 with {name}")
+            return True
+        return False
+
+    def _encode_h264(self, yuv):
+        """Encode one 320×240 I420 image; returns the packet or ``None``."""
+        planes = self._av_frame.planes
+        planes[0].update(yuv[:240])
+        planes[1].update(yuv[240:300])
+        planes[2].update(yuv[300:])
+        self._av_frame.pts = self._pts
+        self._pts += 1
+        packets = self.h264.encode(self._av_frame)
+        if not packets:
+            return None
+        # zerolatency emits one packet per frame
+        return packets[0] if len(packets) == 1 else b"".join(bytes(p) for p in packets)
+
+    def encode(self, frame):
+        """Encode a BGR frame; returns a bytes-like object or ``None``."""
+        if self.h264 is not None:
+            self._yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420, dst=self._yuv)
+            return self._encode_h264(self._yuv)
+        if self.tj is not None:
+            return self.tj.encode(frame, quality=self.jpeg_quality,
+                                  jpeg_subsample=TJSAMP_420, pixel_format=TJPF_BGR)
+        ret, buffer = cv2.imencode('.jpg', frame, self.encode_param)
+        if not ret:
+            return None
+        # The encoder's buffer is sent as is, without a copy to bytes
+        return memoryview(buffer).cast('B')
+
+    def _adapt_quality(self, elapsed: float) -> None:
+        """Lower the quality when a frame took too long, raise it when idle."""
+        if elapsed > 0.9 * self.frame_interval and self.jpeg_quality > 20:
+            self.jpeg_quality = max(20, self.jpeg_quality - 5)
+        elif elapsed < 0.5 * self.frame_interval and self.jpeg_quality < 70:
+            self.jpeg_quality += 1
+        else:
+            return
+        if self.encode_param:
+            self.encode_param[1] = self.jpeg_quality
+
+    def send_frame(self, data) -> None:
+        """Send one encoded frame to the registered client, if any.
+
+        The frame is split into ``_FRAG_PAYLOAD``‑sized chunks, each sent
+        as its own datagram behind a ``_FRAG_HDR``.  Header and payload are
+        passed to ``sendmsg`` separately so the payload is not copied, and
+        the header buffer is reused, so sending allocates nothing per frame.
+        """
+        client_addr = self.get_client_addr()
+        if client_addr is None:
+            return
+        view = memoryview(data).cast('B')
+        total = max(1, math.ceil(len(view) / _FRAG_PAYLOAD))
+        frame_id = self.frame_id
+        self.frame_id = (frame_id + 1) & 0xFFFFFFFF
+        header = self._frag_header
+        try:
+            for idx in range(total):
+                chunk = view[idx * _FRAG_PAYLOAD:(idx + 1) * _FRAG_PAYLOAD]
+                _FRAG_HDR.pack_into(header, 0, frame_id, idx, total)
+                self.udp_socket.sendmsg([header, chunk], [], 0, client_addr)
+        except Exception as e:
+            print(f"[Video] Error sending frame: {e}")
 
     def run(self) -> None:
+        # Stay off CPU 0, which is reserved for motor control.  Done here
+        # rather than from the parent so that threads started by picamera2
+        # inherit it.
+        pin_current_thread(set(range(1, os.cpu_count() or 1)), tag="[Video]")
+        # Created here so the socket and encoder belong to the child alone
+        self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Room for bursts of several frames' worth of fragments
+        self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _VIDEO_SNDBUF)
+        self._init_encoder()
+        try:
+            if Picamera2 is not None:
+                try:
+                    self._run_picamera()
+                    return
+                except Exception as e:
+                    print(f"[Video] picamera2 capture failed ({e}); falling back to OpenCV")
+                    if self.picam2 is not None:
+                        self.picam2.close()
+                        self.picam2 = None
+            self._run_opencv()
+        except KeyboardInterrupt:
+            # Ctrl+C reaches the whole process group; the parent shuts down
+            pass
+        finally:
+            self.udp_socket.close()
+
+    def _run_picamera(self) -> None:
+        """Capture 320×240 YUV420 frames scaled by the ISP and stream them.
+
+        With the hardware MJPEG encoder, the encoder thread inside
+        ``picamera2`` calls :meth:`send_frame` for every frame and this
+        thread only waits for :meth:`stop`.  Boards without one (e.g. the
+        Pi 5) encode the captured frames in software instead.
+        """
+        self.picam2 = Picamera2()
+        config = self.picam2.create_video_configuration(
+            main={"size": (320, 240), "format": "YUV420"},
+            controls={"FrameRate": 1.0 / self.frame_interval},
+        )
+        self.picam2.configure(config)
+        encoder = None
+        if self.h264 is None:
+            try:
+                encoder = MJPEGEncoder()
+            except Exception as e:
+                if cv2 is None:
+                    raise
+                print(f"[Video] Hardware JPEG encoder unavailable ({e}); encoding in software")
+        try:
+            if encoder is not None:
+                self.picam2.start_recording(encoder, _UDPFrameOutput(self.send_frame))
+                print("[Video] Camera opened; streaming with the hardware JPEG encoder")
+                while self.running:
+                    time.sleep(0.5)
+            else:
+                self.picam2.start()
+                print("[Video] Camera opened; starting streaming loop")
+                while self.running:
+                    if self.get_client_addr() is None:
+                        # No client registered; wait and retry
+                        time.sleep(0.5)
+                        continue
+                    # capture_array blocks until the next frame, so the
+                    # camera paces this loop
+                    yuv = self.picam2.capture_array("main")
+                    t0 = time.monotonic()
+                    if self.h264 is not None:
+                        # The camera already delivers I420; no conversion
+                        data = self._encode_h264(yuv)
+                    else:
+                        data = self.encode(cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420))
+                    if data is not None:
+                        self.send_frame(data)
+                        if self.h264 is None:
+                            self._adapt_quality(time.monotonic() - t0)
+        finally:
+            if encoder is not None:
+                self.picam2.stop_recording()
+            else:
+                self.picam2.stop()
+            self.picam2.close()
+            self.picam2 = None
+            print("[Video] Streaming process stopped")
+
+    def _run_opencv(self) -> None:
         if cv2 is None:
             print("[Video] OpenCV not available; video streaming disabled")
             return
@@ -213,158 +579,271 @@ class VideoStreamer(threading.Thread):
         if not self.cap.isOpened():
             print("[Video] Failed to open camera; video streaming disabled")
             return
+        # Ask the driver for 320x240 directly so no CPU resize is needed
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
+        self.cap.set(cv2.CAP_PROP_FPS, 1.0 / self.frame_interval)
         print("[Video] Camera opened; starting streaming loop")
+        # Frames are paced against a monotonic deadline so the time spent
+        # capturing, encoding and sending does not lower the frame rate
+        next_deadline = time.monotonic()
         while self.running:
             client_addr = self.get_client_addr()
             if client_addr is None:
                 # No client registered; wait and retry
                 time.sleep(0.5)
+                next_deadline = time.monotonic()
                 continue
             ret, frame = self.cap.read()
             if not ret:
                 continue
-            # Resize and compress
-            frame_small = cv2.resize(frame, (320, 240))
-            # Encode as JPEG; quality can be adjusted (0-100)
-            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 50]
-            ret, buffer = cv2.imencode('.jpg', frame_small, encode_param)
-            if not ret:
+            # Resize only if the driver ignored the requested size
+            if frame.shape[1] != 320 or frame.shape[0] != 240:
+                frame = cv2.resize(frame, (320, 240))
+            # Encode as JPEG
+            t0 = time.monotonic()
+            data = self.encode(frame)
+            if data is None:
                 continue
-            data = buffer.tobytes()
-            try:
-                # Send frame via UDP
-                self.udp_socket.sendto(data, client_addr)
-            except Exception as e:
-                print(f"[Video] Error sending frame: {e}")
-            time.sleep(self.frame_interval)
+            # Send frame via UDP
+            self.send_frame(data)
+            if self.h264 is None:
+                self._adapt_quality(time.monotonic() - t0)
+            next_deadline += self.frame_interval
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Running behind; start a new schedule instead of bursting
+                next_deadline = time.monotonic()
         # Cleanup
         if self.cap is not None:
             self.cap.release()
-        print("[Video] Streaming thread stopped")
+        print("[Video] Streaming process stopped")
 
     def stop(self) -> None:
-        self.running = False
+        self._stopped.set()
 
 
 class CommandServer:
     """TCP server to handle incoming commands from the central computer."""
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(self, host: str, port: int, fps: float = 20.0, codec: str = "jpeg") -> None:
         self.host = host
         self.port = port
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        # Allow immediate reuse of the address after the server exits
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(1)
-        print(f"[Server] Listening for control connection on {self.host}:{self.port}")
-
-        # UDP socket for video streaming
-        self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.client_video_addr: Optional[Tuple[str, int]] = None
-        self.video_streamer = VideoStreamer(self.udp_socket, self.get_client_video_addr)
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Handler task -> stream reader of every connected client
+        self._clients: dict = {}
+
+        # Video streaming process; started before the GPIO connection is
+        # opened so the child does not inherit it
+        self._client_video_addr: Optional[Tuple[str, int]] = None
+        self.video_streamer = VideoStreamer(fps, codec)
         self.video_streamer.start()
+        # The control loop and motor PWM get CPU 0 with real-time priority,
+        # so video encoding spikes cannot delay motor commands.  Applied
+        # after the fork so the streamer does not inherit it.
+        pin_current_thread({0}, fifo_priority=20, tag="[Server]")
 
         # Car controller stub
         self.controller = CarController()
+        # Last (direction, speed, steering) applied; the joystick repeats
+        # unchanged moves, which are dropped before reaching the controller
+        self._last_move: Optional[Tuple[str, float, float]] = None
+        # Command name -> handler; one dict lookup per message
+        self._handlers = {
+            "register_video": self._h_register_video,
+            "move": self._h_move,
+            "stop": self._h_stop,
+            "quit": self._h_quit,
+            "status": self._h_status,
+        }
+
+    @property
+    def client_video_addr(self) -> Optional[Tuple[str, int]]:
+        return self._client_video_addr
 
-    def get_client_video_addr(self) -> Optional[Tuple[str, int]]:
-        return self.client_video_addr
+    @client_video_addr.setter
+    def client_video_addr(self, addr: Optional[Tuple[str, int]]) -> None:
+        self._client_video_addr = addr
+        self.video_streamer.set_client_addr(addr)
 
-    def handle_client(self, client_socket: socket.socket, addr: Tuple[str, int]) -> None:
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        addr = writer.get_extra_info('peername')
         print(f"[Server] Accepted connection from {addr}")
+        # Small replies must not wait for Nagle's algorithm
+        sock = writer.get_extra_info('socket')
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Replies are queued and written by a separate task, which sends
+        # everything queued since its last write in a single call
+        out_q: asyncio.Queue = asyncio.Queue()
+        writer_task = asyncio.create_task(self._write_responses(writer, out_q))
+        self._clients[asyncio.current_task()] = reader
         try:
-            # We will accumulate data until a newline is found.  Messages are
-            # separated by newlines to make parsing easier.
-            buffer = b""
+            # central_client.py sends binary frames (it pairs with
+            # raspi_server.py) that start with a command id, not with the
+            # '{' of a JSON message; it may never send a newline at all
+            try:
+                head = await reader.readexactly(1)
+            except asyncio.IncompleteReadError:
+                print("[Server] Client disconnected")
+                return
+            if head != b"{" and not head.isspace():
+                print(f"[Server] {addr} sent binary data; this server only speaks "
+                      "the JSON protocol of controle.py")
+                return
+            # Messages are separated by newlines; the stream reader keeps
+            # the partial input buffered between reads.
             while True:
-                data = client_socket.recv(4096)
-                if not data:
+                try:
+                    line = head + await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:
                     print("[Server] Client disconnected")
                     break
-                buffer += data
-                # Process each complete line (message)
-                while b"\n" in buffer:
-                    line, buffer = buffer.split(b"\n", 1)
-                    if not line:
-                        continue
-                    try:
-                        msg = json.loads(line.decode('utf-8'))
-                    except json.JSONDecodeError as e:
-                        print(f"[Server] Failed to decode message: {e}")
-                        continue
-                    self.process_message(msg, client_socket, addr)
+                head = b""
+                line = line[:-1]
+                # Blank or whitespace-only lines (e.g. "\r") carry no message
+                if not line.strip():
+                    continue
+                try:
+                    # orjson parses the raw bytes without decoding them first
+                    msg = orjson.loads(line) if orjson is not None else json.loads(line.decode('utf-8'))
+                except json.JSONDecodeError as e:
+                    print(f"[Server] Failed to decode message: {e}")
+                    continue
+                self.process_message(msg, out_q, addr)
+                if writer_task.done():
+                    # The writer failed (e.g. the peer reset); re-raise its error
+                    writer_task.result()
+                if not self._server.is_serving():
+                    # A quit command closed the server
+                    break
+        except asyncio.CancelledError:
+            # Cancelled during shutdown; close the connection quietly
+            pass
         except Exception as e:
             print(f"[Server] Error during client handling: {e}")
         finally:
-            client_socket.close()
+            self._clients.pop(asyncio.current_task(), None)
+            if not writer_task.done():
+                # Let the writer send the replies still queued, then stop
+                out_q.put_nowait(None)
+                try:
+                    await asyncio.wait_for(writer_task, 1.0)
+                except asyncio.TimeoutError:
+                    print("[Server] Timed out sending queued replies")
+                except Exception as e:
+                    print(f"[Server] Error sending queued replies: {e}")
+            writer.close()
             # Reset video address on client disconnect
             if self.client_video_addr and self.client_video_addr[0] == addr[0]:
                 print("[Server] Clearing registered video client")
                 self.client_video_addr = None
 
-    def process_message(self, msg: dict, client_socket: socket.socket, addr: Tuple[str, int]) -> None:
-        cmd = msg.get("cmd")
-        if cmd == "register_video":
-            port = int(msg.get("video_port", 0))
-            if port <= 0 or port > 65535:
-                print(f"[Server] Invalid video port received: {port}")
+    @staticmethod
+    async def _write_responses(writer: asyncio.StreamWriter, out_q: asyncio.Queue) -> None:
+        """Write queued replies until a ``None`` sentinel is queued.
+
+        Errors from ``drain()`` end the task; ``handle_client`` re-raises
+        them so the connection is closed instead of queueing forever.
+        """
+        while True:
+            chunks = [await out_q.get()]
+            while not out_q.empty():
+                chunks.append(out_q.get_nowait())
+            done = chunks[-1] is None
+            if done:
+                chunks.pop()
+            if chunks:
+                writer.write(b"".join(chunks))
+                await writer.drain()
+            if done:
                 return
-            # Save the client's IP address and port for video streaming
-            self.client_video_addr = (addr[0], port)
-            print(f"[Server] Registered video client at {self.client_video_addr}")
-        elif cmd == "move":
-            # Extract desired motion values
-            direction = msg.get("direction", "stop")
-            speed = float(msg.get("speed", 0.0))
-            steering = float(msg.get("steering", 0.0))
-            if direction == "forward":
-                # positive speed means forward
-                self.controller.set_speed_and_steering(speed, steering)
-            elif direction == "backward":
-                # negative speed means backward
-                self.controller.set_speed_and_steering(-speed, steering)
-            else:
-                # unknown or "stop" -> stop motors
-                self.controller.set_speed_and_steering(0.0, 0.0)
-        elif cmd == "stop":
-            self.controller.stop()
-        elif cmd == "quit":
-            print("[Server] Quit command received; shutting down")
-            # Stop video and exit the main loop
-            self.video_streamer.stop()
-            self.server_socket.close()
-        elif cmd == "status":
-            # Send a status response back to the client
-            status = {
-                "battery": 100,  # placeholder for battery level
-                "speed": self.controller.speed,
-                "steering": self.controller.steering,
-            }
-            resp = json.dumps(status).encode('utf-8') + b"\n"
-            client_socket.sendall(resp)
-        else:
+
+    def process_message(self, msg: dict, out_q: asyncio.Queue, addr: Tuple[str, int]) -> None:
+        cmd = msg.get("cmd")
+        handler = self._handlers.get(cmd) if isinstance(cmd, str) else None
+        if handler is None:
             print(f"[Server] Unknown command: {cmd}")
+            return
+        handler(msg, out_q, addr)
+
+    def _h_register_video(self, msg: dict, out_q: asyncio.Queue, addr: Tuple[str, int]) -> None:
+        port = int(msg.get("video_port", 0))
+        if port <= 0 or port > 65535:
+            print(f"[Server] Invalid video port received: {port}")
+            return
+        # Save the client's IP address and port for video streaming
+        self.client_video_addr = (addr[0], port)
+        print(f"[Server] Registered video client at {self.client_video_addr}")
+
+    def _h_move(self, msg: dict, out_q: asyncio.Queue, addr: Tuple[str, int]) -> None:
+        # Extract desired motion values
+        direction = msg.get("direction", "stop")
+        speed = float(msg.get("speed", 0.0))
+        steering = float(msg.get("steering", 0.0))
+        key = (direction, round(speed, 3), round(steering, 3))
+        if key == self._last_move:
+            return
+        self._last_move = key
+        if direction == "forward":
+            # positive speed means forward
+            self.controller.set_speed_and_steering(speed, steering)
+        elif direction == "backward":
+            # negative speed means backward
+            self.controller.set_speed_and_steering(-speed, steering)
+        else:
+            # unknown or "stop" -> stop motors
+            self.controller.set_speed_and_steering(0.0, 0.0)
+
+    def _h_stop(self, msg: dict, out_q: asyncio.Queue, addr: Tuple[str, int]) -> None:
+        self._last_move = None
+        self.controller.stop()
+
+    def _h_quit(self, msg: dict, out_q: asyncio.Queue, addr: Tuple[str, int]) -> None:
+        self._last_move = None
+        print("[Server] Quit command received; shutting down")
+        # Stop video and exit the main loop
+        self.video_streamer.stop()
+        if self._server is not None:
+            self._server.close()
+
+    def _h_status(self, msg: dict, out_q: asyncio.Queue, addr: Tuple[str, int]) -> None:
+        # Send a status response back to the client
+        status = {
+            "battery": 100,  # placeholder for battery level
+            "speed": self.controller.speed,
+            "steering": self.controller.steering,
+        }
+        if orjson is not None:
+            resp = orjson.dumps(status) + b"\n"
+        else:
+            resp = json.dumps(status).encode('utf-8') + b"\n"
+        out_q.put_nowait(resp)
 
-    def serve_forever(self) -> None:
+    async def serve_forever(self) -> None:
+        # GPIO writes only toggle registers and return at once, so the
+        # controller is called directly from the event loop.
+        self._server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, reuse_address=True)
+        print(f"[Server] Listening for control connection on {self.host}:{self.port}")
         try:
-            while True:
-                client_socket, addr = self.server_socket.accept()
-                # Spawn a thread to handle the client
-                client_thread = threading.Thread(
-                    target=self.handle_client, args=(client_socket, addr), daemon=True
-                )
-                client_thread.start()
-        except OSError:
-            # Server socket closed due to quit command
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            # Server closed due to quit command
             pass
         finally:
             # Clean up
-            print("[Server] Closing server and stopping video thread")
+            print("[Server] Closing server and stopping video process")
+            self._server.close()
+            # End the other clients' read loops so their handlers finish
+            # (and flush queued replies) before the event loop is torn down
+            for reader in self._clients.values():
+                reader.feed_eof()
+            if self._clients:
+                await asyncio.wait(list(self._clients), timeout=2.0)
             self.video_streamer.stop()
-            self.video_streamer.join()
-            self.server_socket.close()
-            self.udp_socket.close()
+            self.video_streamer.join(timeout=2.0)
 
 
 def parse_args() -> argparse.Namespace:
@@ -372,15 +851,20 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--host', default='0.0.0.0', help='IP address to bind the TCP server')
     parser.add_argument('--port', type=int, default=5051, help='TCP port to listen on')
     parser.add_argument('--fps', type=float, default=20.0, help='Frame rate for video streaming')
+    parser.add_argument('--codec', choices=('jpeg', 'h264'), default='jpeg',
+                        help='Video codec; h264 needs PyAV and --codec h264 on the client')
+    parser.add_argument('--verbose', action='store_true', help='Log every motor command')
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    server = CommandServer(args.host, args.port)
-    # Adjust frame rate if provided
-    server.video_streamer.frame_interval = 1.0 / args.fps
-    server.serve_forever()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+    server = CommandServer(args.host, args.port, fps=args.fps, codec=args.codec)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == '__main__':
@@ -14,32 +14,35 @@ joystick.init()
 print(f"Joystick detectado: {joystick.get_name()}")
 print("Pressione botões ou mova eixos para ver os valores. Ctrl+C para sair.")
 
-clock = pygame.time.Clock()
+# Só os eventos do joystick entram na fila; o resto é descartado pelo pygame
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN, pygame.JOYHATMOTION])
+
+ZONA_MORTA = 0.05
+ultimo_eixo = {}
 
 try:
     while True:
-        pygame.event.pump()
-
-        # Botões
-        for i in range(joystick.get_numbuttons()):
-            if joystick.get_button(i):
-                print(f"[{time.time()}] Botão {i} pressionado")
-
-        # Eixos analógicos (gatilhos e sticks)
-        for i in range(joystick.get_numaxes()):
-            valor = joystick.get_axis(i)
-            if abs(valor) > 0.05:
-                print(f"[{time.time()}] Eixo {i} valor: {valor:.2f}")
-
-        # HAT (D-pad)
-        for i in range(joystick.get_numhats()):
-            hat = joystick.get_hat(i)
-            if hat != (0, 0):
-                print(f"[{time.time()}] HAT {i} direção: {hat}")
-
-        clock.tick(30)
+        # Bloqueia até o joystick mudar; nada é lido enquanto ele está parado.
+        # O timeout deixa o Ctrl+C ser atendido mesmo sem eventos.
+        eventos = [pygame.event.wait(500)] + pygame.event.get()
+        for e in eventos:
+            # Botões
+            if e.type == pygame.JOYBUTTONDOWN:
+                print(f"[{time.time()}] Botão {e.button} pressionado")
+
+            # Eixos analógicos (gatilhos e sticks): só mostra mudanças maiores que a zona morta
+            elif e.type == pygame.JOYAXISMOTION:
+                if abs(e.value - ultimo_eixo.get(e.axis, 0.0)) > ZONA_MORTA:
+                    ultimo_eixo[e.axis] = e.value
+                    print(f"[{time.time()}] Eixo {e.axis} valor: {e.value:.2f}")
+
+            # HAT (D-pad)
+            elif e.type == pygame.JOYHATMOTION:
+                if e.value != (0, 0):
+                    print(f"[{time.time()}] HAT {e.hat} direção: {e.value}")
 
 except KeyboardInterrupt:
     print("Encerrado pelo usuário.")
 finally:
-    pygame.quit()
\ No newline at end of file
+    pygame.quit()
@@ -0,0 +1,49 @@
+"""
+Low-latency helpers shared by the car's client and server scripts.
+
+The whole repository is cloned on both the Raspberry Pi and the central
+computer, so ``servidor.py``, ``raspi_server.py``, ``central_client.py``
+and ``cliente.py`` import these from here instead of each keeping its own
+copy.
+"""
+
+import os
+import socket
+from typing import Optional
+
+# Send buffer for control sockets; a few hundred commands at most
+_CONTROL_SNDBUF = 16384
+
+
+def pin_current_thread(cpus: set, fifo_priority: Optional[int] = None, tag: str = "") -> None:
+    """Pin the calling thread to ``cpus`` and optionally make it ``SCHED_FIFO``.
+
+    Called from a process's main thread before it starts other threads,
+    this pins the whole process, as ``servidor.py`` does for its control
+    loop (CPU 0) and video process (the remaining CPUs).  CPUs the machine
+    does not have are ignored.  Only supported on Linux; elsewhere, or
+    without the required privileges, the thread keeps its default
+    scheduling and a message prefixed with ``tag`` (e.g. ``"[Video]"``)
+    is printed.
+    """
+    try:
+        cpus = {cpu for cpu in cpus if cpu < (os.cpu_count() or 1)}
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+        if fifo_priority is not None:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(fifo_priority))
+    except (AttributeError, OSError) as e:
+        print(f"{tag} Could not change CPU affinity/priority: {e}")
+
+
+def tune_control_socket(sock: socket.socket) -> None:
+    """Configure a TCP control socket for low latency.
+
+    Disables Nagle's algorithm so small commands are sent immediately,
+    enables keep-alive so a dropped Wi-Fi link is noticed, and keeps the
+    send buffer small so stale commands cannot queue up behind a stalled
+    link.
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _CONTROL_SNDBUF)